@@ -0,0 +1,426 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+from metrics import METRICS, route_context
+from startup import load_route, route_loaded
+
+if TYPE_CHECKING:
+    from web_scraper import ScrapeResult
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+# Seconds each stage may take before it is abandoned with asyncio.TimeoutError
+STAGE_TIMEOUTS: Dict[str, float] = {
+    "classify": 5.0,
+    "scrape": 30.0,
+    "sql_generation": 120.0,
+    "sql_execution": 30.0,
+    "llm_generation": 120.0,
+}
+
+# Maximum calls in flight per backend, across all concurrent requests
+BACKEND_CONCURRENCY: Dict[str, int] = {
+    "classifier": 8,
+    "scraper": 4,
+    "database": 5,
+    "llm": 4,
+}
+
+SPECULATION_CONFIG = {
+    # Also run the runner-up route when the top two class probabilities are closer than this
+    "margin": 0.2,
+    # Routes that may run speculatively; the SQL route is left out because it can write
+    "routes": ("static", "dynamic"),
+}
+
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+def _stage_executor() -> ThreadPoolExecutor:
+    """Worker threads of all stages, shared by every event loop and never joined on loop shutdown."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=sum(BACKEND_CONCURRENCY.values()), thread_name_prefix="pipeline-stage"
+                )
+    return _executor
+
+# Worker futures started by the stages of a speculative route, so its cost can be measured after cancellation
+_stage_futures: contextvars.ContextVar[Optional[List[Future]]] = contextvars.ContextVar("stage_futures", default=None)
+
+_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+def _limit(backend: str) -> asyncio.Semaphore:
+    """Concurrency limit of a backend on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphores = _limits.setdefault(loop, {})
+    if backend not in semaphores:
+        semaphores[backend] = asyncio.Semaphore(BACKEND_CONCURRENCY[backend])
+    return semaphores[backend]
+
+async def run_stage(stage: str, backend: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking stage in a worker thread under its backend limit and timeout.
+
+    Waiting for a backend slot counts towards the stage timeout. On timeout or
+    cancellation the caller is released immediately, but the backend slot stays
+    taken until the worker thread has finished its call, so BACKEND_CONCURRENCY
+    bounds the calls actually running.
+
+    Args:
+        stage (str): Key of STAGE_TIMEOUTS.
+        backend (str): Key of BACKEND_CONCURRENCY.
+        func (Callable[..., Any]): Blocking function to run.
+
+    Returns:
+        Any: Return value of func.
+
+    Raises:
+        asyncio.TimeoutError: If the stage exceeds its timeout.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _limit(backend)
+
+    def release(_: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            # The event loop has closed; its semaphores are gone with it
+            pass
+
+    async def limited() -> Any:
+        await semaphore.acquire()
+        try:
+            context = contextvars.copy_context()
+            future = _stage_executor().submit(context.run, func, *args, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+        # Released when the thread is done, not when the awaiting task gives up
+        future.add_done_callback(release)
+        tracked = _stage_futures.get()
+        if tracked is not None:
+            tracked.append(future)
+        return await asyncio.wrap_future(future)
+
+    try:
+        return await asyncio.wait_for(limited(), STAGE_TIMEOUTS[stage])
+    except asyncio.TimeoutError:
+        logger.error(f"Stage {stage} timed out after {STAGE_TIMEOUTS[stage]}s")
+        raise
+
+async def _load_route(route: str) -> None:
+    """Import a route's backends in a worker thread on first use, keeping the event loop free."""
+    if not route_loaded(route):
+        await asyncio.to_thread(load_route, route)
+
+async def classify_query_async(query: str, model) -> str:
+    """Async variant of query_classifier.classify_query."""
+    await _load_route("classifier")
+    from query_classifier import classify_query
+
+    with METRICS.stage("classify"):
+        return await run_stage("classify", "classifier", classify_query, query, model)
+
+async def classify_query_proba_async(query: str, model) -> Dict[str, float]:
+    """Async variant of query_classifier.classify_query_proba."""
+    await _load_route("classifier")
+    from query_classifier import classify_query_proba
+
+    with METRICS.stage("classify"):
+        return await run_stage("classify", "classifier", classify_query_proba, query, model)
+
+async def scrape_async(query: str) -> "ScrapeResult":
+    """Async variant of web_scraper.cached_scrape."""
+    await _load_route("dynamic")
+    from web_scraper import cached_scrape
+
+    return await run_stage("scrape", "scraper", cached_scrape, query)
+
+async def execute_sql_query_async(sql_query: str, params: Optional[Sequence[Any]] = None, max_rows: Optional[int] = None) -> Union[str, List[Dict]]:
+    """Async variant of db_handler.execute_sql_query."""
+    await _load_route("sql")
+    from db_handler import execute_sql_query
+
+    return await run_stage("sql_execution", "database", execute_sql_query, sql_query, params, max_rows)
+
+async def generate_sql_query_async(query: str, db_schema: str) -> str:
+    """Async variant of db_handler.generate_sql_query."""
+    await _load_route("sql")
+    from db_handler import generate_sql_query
+
+    return await run_stage("sql_generation", "llm", generate_sql_query, query, db_schema)
+
+async def get_static_response_async(query: str, history: str = "") -> str:
+    """Async variant of llm_processor.get_static_response."""
+    await _load_route("static")
+    from llm_processor import get_static_response
+
+    return await run_stage("llm_generation", "llm", get_static_response, query, history)
+
+async def process_dynamic_response_async(query: str, results: List[Dict], live_info: Optional[str], snippet: Optional[str], history: str = "") -> str:
+    """Async variant of llm_processor.process_dynamic_response."""
+    await _load_route("dynamic")
+    from llm_processor import process_dynamic_response
+
+    return await run_stage("llm_generation", "llm", process_dynamic_response, query, results, live_info, snippet, history)
+
+async def route_query_async(query: str, query_type: str, history: str = "") -> str:
+    """
+    Answer a classified query without blocking the event loop.
+
+    Args:
+        query (str): User query.
+        query_type (str): Query type ('static', 'dynamic', or 'sql').
+        history (str): Earlier turns of the conversation, for follow-up questions.
+
+    Returns:
+        str: Response to the query.
+    """
+    logger.info(f"Handling query: {query} as {query_type}")
+    with route_context(query_type), METRICS.stage("total"):
+        return await _route(query, query_type, history)
+
+async def answer_dynamic_query_async(query: str, history: str = "") -> str:
+    """Async variant of main.answer_dynamic_query."""
+    results, live_info, snippet = await scrape_async(query)
+    return await process_dynamic_response_async(query, results, live_info, snippet, history)
+
+async def _route(query: str, query_type: str, history: str = "") -> str:
+    """Answer a classified query from its backend; answers that depend on history bypass the caches."""
+    await _load_route(query_type)
+    if query_type == "sql":
+        from db_handler import DB_ROW_CAP, DB_SCHEMA, lookup_sql_query, store_generated_sql
+
+        statement = lookup_sql_query(query, DB_SCHEMA)
+        if statement is None:
+            statement = store_generated_sql(query, DB_SCHEMA, await generate_sql_query_async(query, DB_SCHEMA))
+        return str(await execute_sql_query_async(*statement, max_rows=DB_ROW_CAP))
+    elif query_type == "dynamic":
+        from llm_processor import should_cache_dynamic_response
+        from result_cache import get_result_cache
+
+        if history:
+            return await answer_dynamic_query_async(query, history)
+        return await get_result_cache("dynamic_answer").get_or_compute_async(
+            query,
+            lambda: answer_dynamic_query_async(query),
+            cache_if=should_cache_dynamic_response,
+        )
+    else:
+        from response_cache import get_response_cache
+
+        if history:
+            return await get_static_response_async(query, history)
+        static_cache = get_response_cache()
+        cached = static_cache.lookup(query)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        response = await get_static_response_async(query)
+        static_cache.store(query, response, time.perf_counter() - start)
+        return response
+
+_loop_lock = threading.Lock()
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _pipeline_loop() -> asyncio.AbstractEventLoop:
+    """Long-lived event loop, running in a daemon thread, shared by synchronous callers."""
+    global _background_loop
+    with _loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="pipeline-loop", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+def run_coroutine(coroutine: Awaitable[Any]) -> Any:
+    """
+    Run a pipeline coroutine from synchronous code, e.g. a Streamlit script.
+
+    Unlike asyncio.run, the loop is not torn down afterwards, so the call returns
+    as soon as the coroutine does instead of waiting for worker threads that
+    cancelled tasks left running. Backend limits are shared by all callers.
+
+    Args:
+        coroutine (Awaitable[Any]): Coroutine to run, e.g. route_speculatively_async(...).
+
+    Returns:
+        Any: Return value of the coroutine.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, _pipeline_loop()).result()
+
+_speculation_lock = threading.Lock()
+_speculation_stats = {
+    "decisions": 0,
+    "speculations": 0,
+    "won_by_top": 0,
+    "won_by_runner_up": 0,
+    "no_acceptable_answer": 0,
+    "extra_seconds": 0.0,
+}
+
+def speculation_candidates(probabilities: Dict[str, float]) -> List[str]:
+    """
+    Routes to run for a classified query, best first.
+
+    Args:
+        probabilities (Dict[str, float]): Output of classify_query_proba.
+
+    Returns:
+        List[str]: The top route, plus the runner-up when the classification is
+        too close to call and both routes are in SPECULATION_CONFIG["routes"].
+    """
+    ranked = sorted(probabilities, key=probabilities.get, reverse=True)
+    candidates = ranked[:1]
+    if (
+        len(ranked) > 1
+        and probabilities[ranked[0]] - probabilities[ranked[1]] < SPECULATION_CONFIG["margin"]
+        and set(ranked[:2]) <= set(SPECULATION_CONFIG["routes"])
+    ):
+        candidates = ranked[:2]
+    with _speculation_lock:
+        _speculation_stats["decisions"] += 1
+        _speculation_stats["speculations"] += len(candidates) > 1
+    return candidates
+
+def _record_extra(route: str, start: float, finished: float, futures: List[Future]) -> None:
+    """Record the time a losing route kept backends busy, once its last worker thread is done."""
+    pending = [future for future in futures if not future.done()]
+    remaining = len(pending)
+    lock = threading.Lock()
+
+    def record(end: float) -> None:
+        METRICS.observe_stage("speculation_extra", end - start, route=route)
+        with _speculation_lock:
+            _speculation_stats["extra_seconds"] += end - start
+
+    def worker_done(_: Future) -> None:
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            last = remaining == 0
+        if last:
+            record(time.perf_counter())
+
+    if not pending:
+        record(finished)
+    for future in pending:
+        future.add_done_callback(worker_done)
+
+async def _tracked_route(query: str, route: str, history: str, futures: List[Future]) -> str:
+    """route_query_async, collecting the worker futures its stages start."""
+    _stage_futures.set(futures)
+    return await route_query_async(query, route, history)
+
+def _acceptable(response: str) -> bool:
+    """Whether a route produced a usable answer rather than an apology or error text."""
+    from llm_processor import NO_LIVE_DATA_RESPONSE
+
+    return bool(response) and response != NO_LIVE_DATA_RESPONSE and not response.startswith("Database error")
+
+async def route_speculatively_async(query: str, candidates: List[str], history: str = "") -> str:
+    """
+    Answer a query, racing the two most likely routes when the classifier is unsure.
+
+    The first acceptable answer wins and the other route is cancelled. Its worker
+    thread still finishes the backend call it is in; the time from the start of
+    the race until that thread is done is the extra load recorded in
+    speculation_stats() and the "speculation_extra" stage metric, possibly after
+    this call has returned.
+
+    Args:
+        query (str): User query.
+        candidates (List[str]): Output of speculation_candidates.
+        history (str): Earlier turns of the conversation, for follow-up questions.
+
+    Returns:
+        str: Response to the query.
+    """
+    if len(candidates) == 1:
+        return await route_query_async(query, candidates[0], history)
+
+    logger.info(f"Speculatively routing query as {candidates}")
+    start = time.perf_counter()
+    futures: Dict[str, List[Future]] = {route: [] for route in candidates}
+    finished: Dict[asyncio.Task, float] = {}
+    tasks = {asyncio.create_task(_tracked_route(query, route, history, futures[route])): route for route in candidates}
+    for task in tasks:
+        task.add_done_callback(lambda done: finished.setdefault(done, time.perf_counter()))
+    pending = set(tasks)
+    winner: Optional[asyncio.Task] = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda task: candidates.index(tasks[task])):
+                if not task.cancelled() and task.exception() is None and _acceptable(task.result()):
+                    winner = task
+                    break
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if winner is None:
+        # Neither answer is usable: fall back to what the top route returned or raised
+        winner = next(task for task, route in tasks.items() if route == candidates[0])
+    for task, route in tasks.items():
+        if task is not winner:
+            task.add_done_callback(lambda done, route=route: _record_extra(route, start, finished[done], futures[route]))
+    with _speculation_lock:
+        if not _acceptable(winner.result() if winner.exception() is None else ""):
+            _speculation_stats["no_acceptable_answer"] += 1
+        elif tasks[winner] == candidates[0]:
+            _speculation_stats["won_by_top"] += 1
+        else:
+            _speculation_stats["won_by_runner_up"] += 1
+    logger.info(f"Speculative routing answered via {tasks[winner]}")
+    return winner.result()
+
+def speculation_stats() -> Dict[str, float]:
+    """
+    Speculative routing counters.
+
+    Returns:
+        Dict[str, float]: Routing decisions, how many raced two routes, which route
+        won, races without a usable answer, and seconds spent on losing routes
+        until their worker threads finished.
+    """
+    with _speculation_lock:
+        stats = dict(_speculation_stats)
+    stats["speculation_rate"] = stats["speculations"] / stats["decisions"] if stats["decisions"] else 0.0
+    return stats
+
+async def handle_query_async(query: str, model) -> str:
+    """
+    Async variant of main.handle_query for serving many users concurrently.
+
+    Args:
+        query (str): User query.
+        model: Trained classifier model.
+
+    Returns:
+        str: Response to the query.
+    """
+    probabilities = await classify_query_proba_async(query, model)
+    return await route_speculatively_async(query, speculation_candidates(probabilities))
+
+if __name__ == "__main__":
+    from query_classifier import get_classifier
+
+    async def demo() -> None:
+        model = get_classifier()
+        queries = ["Tell me a joke", "What is the weather today?", "Show me all the users of the database"]
+        responses = await asyncio.gather(*(handle_query_async(query, model) for query in queries), return_exceptions=True)
+        for query, response in zip(queries, responses):
+            logger.info(f"{query} -> {response}")
+
+    asyncio.run(demo())
@@ -0,0 +1 @@
+"""Benchmarks for the query router. Run modules from the repository root, e.g. `python -m benchmarks.classifier`."""
@@ -0,0 +1,149 @@
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from benchmarks.stand_ins import local_backends
+from benchmarks.stats import latency_summary, write_report
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+ROUTE_QUERIES: Dict[str, str] = {
+    "static": "Tell me a joke",
+    "dynamic": "What are the stock prices for Tesla today?",
+    "sql": "Show me all the users of the database",
+}
+
+# Relative slowdown of a p50/p95 latency or throughput drop reported as a regression by --compare
+REGRESSION_THRESHOLD = 0.10
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _measure(call: Callable[[int], object], iterations: int, warmup: int = 2) -> Dict[str, float]:
+    """Time call(i) for each iteration and summarize latency and throughput."""
+    for index in range(warmup):
+        call(-1 - index)
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for index in range(iterations):
+        call_start = time.perf_counter()
+        call(index)
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    return {**latency_summary(latencies), "throughput_qps": iterations / elapsed}
+
+def _uncached(query: str, index: int) -> str:
+    """Tag a query with the iteration number so response caches never hit."""
+    return f"{query} run{index}"
+
+def run_suite(iterations: int, token_latency: float) -> Dict:
+    """
+    Benchmark every route of main.handle_query and each module in isolation against local stand-ins.
+
+    Args:
+        iterations (int): Measured calls per benchmark.
+        token_latency (float): Seconds per generated token on the fake Ollama server.
+
+    Returns:
+        Dict: Environment metadata and one latency/throughput summary per benchmark.
+    """
+    import db_handler
+    import llm_processor
+    import main
+    import sql_templates
+    import web_scraper
+    from query_classifier import classify_query, get_classifier
+
+    model = get_classifier()
+    benchmarks: Dict[str, Dict[str, float]] = {}
+    with local_backends(token_latency=token_latency):
+        for route, query in ROUTE_QUERIES.items():
+            if route == "sql":
+                benchmarks[f"handle_query.{route}"] = _measure(lambda index: main.handle_query(query, model), iterations)
+            else:
+                benchmarks[f"handle_query.{route}"] = _measure(lambda index: main.handle_query(_uncached(query, index), model), iterations)
+
+        benchmarks["query_classifier.classify_query"] = _measure(lambda index: classify_query(ROUTE_QUERIES["static"], model), iterations)
+        benchmarks["web_scraper.scrape"] = _measure(lambda index: web_scraper.scrape(ROUTE_QUERIES["dynamic"]), iterations)
+        benchmarks["db_handler.generate_sql_query"] = _measure(
+            lambda index: db_handler.generate_sql_query(ROUTE_QUERIES["sql"], db_handler.DB_SCHEMA), iterations
+        )
+        benchmarks["sql_templates.match_sql_template"] = _measure(
+            lambda index: sql_templates.match_sql_template(ROUTE_QUERIES["sql"], db_handler.DB_SCHEMA), iterations
+        )
+        benchmarks["db_handler.execute_sql_query"] = _measure(
+            lambda index: db_handler.execute_sql_query("SELECT * FROM users", max_rows=db_handler.DB_ROW_CAP), iterations
+        )
+        benchmarks["llm_processor.get_static_response"] = _measure(
+            lambda index: llm_processor.get_static_response(ROUTE_QUERIES["static"]), iterations
+        )
+        results, live_info, snippet = web_scraper.scrape(ROUTE_QUERIES["dynamic"])
+        benchmarks["llm_processor.process_dynamic_response"] = _measure(
+            lambda index: llm_processor.process_dynamic_response(ROUTE_QUERIES["dynamic"], results, live_info, snippet), iterations
+        )
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "token_latency": token_latency,
+        "benchmarks": benchmarks,
+    }
+
+def compare(baseline: Dict, current: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """
+    List benchmarks that got slower than the baseline by more than threshold.
+
+    Args:
+        baseline (Dict): Earlier run_suite() report.
+        current (Dict): New run_suite() report.
+        threshold (float): Relative change treated as a regression.
+
+    Returns:
+        List[str]: One line per regressed metric.
+    """
+    regressions: List[str] = []
+    for name, stats in current["benchmarks"].items():
+        old = baseline["benchmarks"].get(name)
+        if old is None:
+            continue
+        for metric in ("p50", "p95"):
+            if old[metric] > 0 and (stats[metric] - old[metric]) / old[metric] > threshold:
+                regressions.append(f"{name} {metric}: {old[metric] * 1000:.2f}ms -> {stats[metric] * 1000:.2f}ms")
+        if old["throughput_qps"] > 0 and (old["throughput_qps"] - stats["throughput_qps"]) / old["throughput_qps"] > threshold:
+            regressions.append(f"{name} throughput: {old['throughput_qps']:.1f}/s -> {stats['throughput_qps']:.1f}/s")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the router benchmark suite against local stand-ins.")
+    parser.add_argument("--iterations", type=int, default=50, help="Measured calls per benchmark.")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="Seconds per generated token on the fake Ollama server.")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON report.")
+    parser.add_argument("--compare", help="Earlier JSON report to check for regressions.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+
+    report = run_suite(args.iterations, args.token_latency)
+    for name, stats in report["benchmarks"].items():
+        logger.info(f"{name:45s} p50 {stats['p50'] * 1000:9.2f}ms  p95 {stats['p95'] * 1000:9.2f}ms  {stats['throughput_qps']:9.1f}/s")
+    write_report(report, args.output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            regressions = compare(json.load(baseline_file), report)
+        for line in regressions:
+            logger.warning(f"REGRESSION {line}")
+        sys.exit(1 if regressions else 0)
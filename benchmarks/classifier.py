@@ -0,0 +1,68 @@
+import argparse
+import logging
+import random
+import time
+from typing import Dict, List
+from query_classifier import TRAINING_DATA, get_classifier, classify_query, classify_queries
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+def synthetic_corpus(size: int, seed: int = 0) -> List[str]:
+    """
+    Build a synthetic query corpus by recombining words of the training queries.
+
+    Args:
+        size (int): Number of queries to generate.
+        seed (int): Random seed, so runs are comparable.
+
+    Returns:
+        List[str]: Generated queries.
+    """
+    rng = random.Random(seed)
+    words = [query.split() for query, _ in TRAINING_DATA]
+    corpus: List[str] = []
+    for _ in range(size):
+        first, second = rng.choice(words), rng.choice(words)
+        corpus.append(" ".join(first[: rng.randint(1, len(first))] + second[rng.randint(0, len(second) - 1):]))
+    return corpus
+
+def run(size: int, batch_size: int) -> Dict[str, float]:
+    """
+    Measure classification throughput for single and batched routing.
+
+    Args:
+        size (int): Number of synthetic queries.
+        batch_size (int): Batch size for the batched path.
+
+    Returns:
+        Dict[str, float]: Queries per second for each path and the speedup.
+    """
+    model = get_classifier()
+    corpus = synthetic_corpus(size)
+    # Per-query log lines would dominate the single path, so only time the model work
+    logging.getLogger("query_classifier").setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    single = [classify_query(query, model) for query in corpus]
+    single_qps = size / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    batched = [label for _, label, _ in classify_queries(corpus, model, batch_size=batch_size)]
+    batched_qps = size / (time.perf_counter() - start)
+
+    if single != batched:
+        raise AssertionError("Batched classification disagrees with single-query classification")
+    return {"single_qps": single_qps, "batched_qps": batched_qps, "speedup": batched_qps / single_qps}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark single vs batched query classification.")
+    parser.add_argument("--queries", type=int, default=5000, help="Size of the synthetic corpus.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Batch size for classify_queries.")
+    args = parser.parse_args()
+    stats = run(args.queries, args.batch_size)
+    logger.info(
+        f"Single: {stats['single_qps']:.0f} queries/sec, "
+        f"batched: {stats['batched_qps']:.0f} queries/sec ({stats['speedup']:.1f}x)"
+    )
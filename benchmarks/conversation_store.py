@@ -0,0 +1,84 @@
+import argparse
+import logging
+import statistics
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+from benchmarks.stats import write_report
+from conversation_store import CONVERSATION_CONFIG, ConversationStore
+from llm_processor import estimate_tokens
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+ANSWER = " ".join(
+    ["Tesla shares closed higher today after strong delivery numbers were reported by the company."] * 20
+)
+
+class UnboundedHistory:
+    """Every turn of every session kept verbatim, like one ConversationBufferMemory per user."""
+
+    def __init__(self):
+        self._sessions: Dict[str, List[str]] = {}
+
+    def append(self, session_id: str, query: str, answer: str) -> None:
+        self._sessions.setdefault(session_id, []).append(f"User: {query}\nAssistant: {answer}")
+
+    def history(self, session_id: str) -> str:
+        return "\n".join(self._sessions.get(session_id, []))
+
+def _drive(store, sessions: int, turns: int) -> Dict[str, float]:
+    """Play turns round-robin across sessions, reading the history before each answer."""
+    latencies: List[float] = []
+    prompt_tokens: List[int] = []
+    tracemalloc.start()
+    for turn in range(turns):
+        for session in range(sessions):
+            session_id = f"session-{session}"
+            start = time.perf_counter()
+            history = store.history(session_id)
+            store.append(session_id, f"What about question {turn}?", ANSWER)
+            latencies.append(time.perf_counter() - start)
+            prompt_tokens.append(estimate_tokens(history))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "peak_mb": peak / 2 ** 20,
+        "history_tokens_p50": statistics.median(prompt_tokens),
+        "history_tokens_max": max(prompt_tokens),
+        "turn_p50_ms": statistics.median(latencies) * 1000,
+    }
+
+def run(sessions: int, turns: int, max_sessions: int, db_path: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Compare memory and prompt history size of unbounded per-session buffers and the conversation store.
+
+    Args:
+        sessions (int): Concurrent users.
+        turns (int): Questions asked by each user.
+        max_sessions (int): Sessions the store keeps in memory.
+        db_path (Optional[str]): SQLite file the store writes sessions to, so evicted ones are reloaded.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Peak memory, history tokens per prompt and per-turn overhead.
+    """
+    config = dict(CONVERSATION_CONFIG, max_sessions=max_sessions, db_path=db_path)
+    store = ConversationStore(**config)
+    report = {
+        "unbounded": _drive(UnboundedHistory(), sessions, turns),
+        "conversation_store": _drive(store, sessions, turns),
+    }
+    report["conversation_store"].update(store.stats())
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure conversation memory under many concurrent sessions.")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--db-path", help="SQLite file backing the store, e.g. with --max-sessions below --sessions.")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of logging it.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    write_report(run(args.sessions, args.turns, args.max_sessions, args.db_path), args.output)
@@ -0,0 +1,94 @@
+import argparse
+import logging
+import statistics
+import time
+from typing import Callable, Dict, List
+import llm_processor
+from benchmarks.fake_google import render_results_page
+from benchmarks.fake_ollama import count_tokens
+from benchmarks.stand_ins import local_backends
+from benchmarks.stats import write_report
+from llm_clients import get_llm_client
+from web_scraper import parse_results_page
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+QUERY = "Latest news updates on the stock market"
+
+LEGACY_TEMPLATE = """
+    You are a helpful chatbot. Your role is to give accurate, real-time answers based on the most recent data.
+    Rules:
+    1. Prioritize live data provided.
+    2. Use the latest info from the data fed to you.
+    3. Keep answers crisp, short, and accurate.
+    User's question: {combined_input}
+    Most recent data: {combined_input}
+    """
+
+def legacy_prompt(query: str, results: List[Dict]) -> str:
+    """The dynamic prompt as it was built before context budgeting: every result, inserted twice."""
+    formatted_results = "\n".join(
+        [f"Title: {result['title']}\nSnippet: {result['snippet']}\nURL: {result['url']}" for result in results]
+    )
+    combined_input = f"User Input: {query}\n\nMost Recent Data:\n{formatted_results}"
+    return LEGACY_TEMPLATE.format(combined_input=combined_input)
+
+def sample_results(pages: int) -> List[Dict]:
+    """Results of several fake result pages, as scrape_many would return them before deduplication."""
+    scraped = [parse_results_page(render_results_page(QUERY, start=page * 10), QUERY) for page in range(pages)]
+    # Scraping a reformulation returns the first page again
+    scraped.append(scraped[0])
+    results: List[Dict] = []
+    for page_results, _, _ in scraped:
+        results.extend(page_results)
+    return results
+
+def _time_generation(build: Callable[[str, List[Dict]], str], results: List[Dict], rounds: int) -> List[float]:
+    client = get_llm_client(llm_processor.DYNAMIC_MODEL)
+    latencies: List[float] = []
+    for _ in range(rounds):
+        prompt = build(QUERY, results)
+        start = time.perf_counter()
+        client.generate(prompt)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def run(rounds: int, pages: int, prompt_token_latency: float, token_latency: float) -> Dict[str, Dict[str, float]]:
+    """
+    Compare prompt size and generation latency of the legacy and the budgeted dynamic prompt.
+
+    Args:
+        rounds (int): Generations per prompt builder.
+        pages (int): Fake result pages scraped for the query.
+        prompt_token_latency (float): Seconds per prompt token (prefill) on the fake Ollama server.
+        token_latency (float): Seconds per generated token on the fake Ollama server.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Prompt tokens and median generation latency of each builder.
+    """
+    results = sample_results(pages)
+    builders = {"legacy": legacy_prompt, "budgeted": llm_processor._dynamic_prompt}
+    report: Dict[str, Dict[str, float]] = {}
+    with local_backends(token_latency=token_latency, prompt_token_latency=prompt_token_latency):
+        for name, build in builders.items():
+            prompt = build(QUERY, results)
+            latencies = _time_generation(build, results, rounds)
+            report[name] = {
+                "prompt_tokens": count_tokens(prompt),
+                "prompt_chars": len(prompt),
+                "generation_p50": statistics.median(latencies),
+            }
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure dynamic prompt size and generation latency.")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=3, help="Result pages scraped for the query.")
+    parser.add_argument("--prompt-token-latency", type=float, default=0.0005, help="Seconds per prompt token.")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="Seconds per generated token.")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of logging it.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    write_report(run(args.rounds, args.pages, args.prompt_token_latency, args.token_latency), args.output)
@@ -0,0 +1,171 @@
+import argparse
+import html
+import logging
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, quote_plus, urlparse
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><title>Google</title></head>
+<body><form action="/search" method="get"><input name="q" type="text"></form></body></html>
+"""
+
+RESULT_TEMPLATE = """<div class="g"><div class="tF2Cxc">
+<a href="{url}"><h3>{title}</h3></a>
+<div class="VwiC3b yXK7lf p4wth r025kc hJNv6b Hdw6tb">{date}<span>{snippet}</span></div>
+</div></div>
+"""
+
+WEATHER_WIDGET = """<div id="wob_wc"><span id="wob_tm">21</span><img alt="Partly cloudy" src="weather.png"></div>
+"""
+
+FEATURED_SNIPPET = """<div class="VkpGBb">{snippet}</div>
+"""
+
+def load_pages(directory: str) -> List[str]:
+    """
+    Read saved result pages (*.html) from a directory, sorted by file name.
+
+    Args:
+        directory (str): Directory of saved pages.
+
+    Returns:
+        List[str]: Page sources.
+    """
+    pages: List[str] = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".html"):
+            with open(os.path.join(directory, name), encoding="utf-8") as page:
+                pages.append(page.read())
+    return pages
+
+def render_results_page(query: str, results: int = 10, start: int = 0, featured: bool = False) -> str:
+    """
+    Render a search results page with the markup web_scraper extracts.
+
+    Args:
+        query (str): Searched query.
+        results (int): Number of organic results on the page.
+        start (int): Offset of the first result, as in Google's `start` parameter.
+        featured (bool): Include a featured snippet.
+
+    Returns:
+        str: HTML document.
+    """
+    escaped = html.escape(query)
+    today = datetime.now().strftime("%b %d, %Y")
+    parts = [f"<!DOCTYPE html>\n<html><head><title>{escaped} - Google Search</title></head><body><div id=\"search\">\n"]
+    if "weather" in query.lower():
+        parts.append(WEATHER_WIDGET)
+    if featured:
+        parts.append(FEATURED_SNIPPET.format(snippet=f"Featured answer for {escaped}"))
+    for index in range(start, start + results):
+        parts.append(RESULT_TEMPLATE.format(
+            url=f"https://example.com/{index}?q={quote_plus(query)}",
+            title=f"Result {index} for {escaped}",
+            date=f'<span class="f">{today}</span> — ' if index % 2 == 0 else "",
+            snippet=f"Snippet {index} about {escaped}.",
+        ))
+    parts.append("</div></body></html>\n")
+    return "".join(parts)
+
+class FakeGoogleServer:
+    """
+    Local HTTP server that stands in for Google search.
+
+    Serves a homepage with a `q` search box and a `/search` results page, so
+    web_scraper can run against it by passing `search_url=server.url`. When
+    `pages` is given, those saved result pages are served in rotation instead
+    of generated ones.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        results: int = 10,
+        featured: bool = False,
+        delay: float = 0.0,
+        pages: Optional[List[str]] = None,
+    ):
+        self.pages = pages or []
+        self.results = results
+        self.featured = featured
+        self.delay = delay
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                server.requests += 1
+                parsed = urlparse(self.path)
+                if parsed.path == "/search":
+                    params = parse_qs(parsed.query)
+                    query = params.get("q", [""])[0]
+                    start = int(params.get("start", ["0"])[0])
+                    if server.delay:
+                        threading.Event().wait(server.delay)
+                    if server.pages:
+                        body = server.pages[(server.requests - 1) % len(server.pages)]
+                    else:
+                        body = render_results_page(query, server.results, start, server.featured)
+                elif parsed.path == "/":
+                    body = HOME_PAGE
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug(format % args)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def start(self) -> "FakeGoogleServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeGoogleServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve fake Google search pages.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--featured", action="store_true", help="Include a featured snippet on result pages.")
+    parser.add_argument("--pages", help="Directory of saved result pages (*.html) to serve instead of generated ones.")
+    args = parser.parse_args()
+    server = FakeGoogleServer(port=args.port, featured=args.featured, pages=load_pages(args.pages) if args.pages else None)
+    logger.info(f"Serving fake Google at {server.url}")
+    server.serve_forever()
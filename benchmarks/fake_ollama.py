@@ -0,0 +1,154 @@
+import argparse
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLY = "This is a canned answer from the fake Ollama server."
+
+def count_tokens(text: str) -> int:
+    """Rough token count used by the fake server: one token per whitespace-separated word."""
+    return len(text.split())
+
+class FakeOllamaServer:
+    """
+    Local HTTP server implementing the parts of the Ollama API the router uses.
+
+    Answers /api/generate (streaming and non-streaming) with a canned reply, or
+    with reply(prompt) when reply is callable, sleeping prompt_token_latency per
+    prompt token (prefill) and token_latency per generated token. Point
+    llm_clients.OLLAMA_CONFIG["host"] at `url`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        reply: Union[str, Callable[[str], str]] = DEFAULT_REPLY,
+        token_latency: float = 0.0,
+        prompt_token_latency: float = 0.0,
+    ):
+        self.reply = reply
+        self.token_latency = token_latency
+        self.prompt_token_latency = prompt_token_latency
+        self.requests = 0
+        self.connections = 0
+        self.prompts: List[str] = []
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def _send_json(self, payload: Dict, status: int = 200) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _write_chunk(self, payload: Dict) -> None:
+                line = (json.dumps(payload) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+                self.wfile.flush()
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if self.path != "/api/generate":
+                    self._send_json({"error": f"unsupported endpoint {self.path}"}, status=404)
+                    return
+                prompt = request.get("prompt", "")
+                with server._lock:
+                    server.requests += 1
+                    server.prompts.append(prompt)
+                started = time.perf_counter()
+                prompt_tokens = count_tokens(prompt)
+                time.sleep(prompt_tokens * server.prompt_token_latency)
+                reply = server.reply(prompt) if callable(server.reply) else server.reply
+                tokens = reply.split(" ")
+                base = {"model": request.get("model", ""), "created_at": datetime.now(timezone.utc).isoformat()}
+
+                def final() -> Dict:
+                    elapsed = int((time.perf_counter() - started) * 1e9)
+                    return {
+                        **base,
+                        "response": "",
+                        "done": True,
+                        "done_reason": "stop",
+                        "total_duration": elapsed,
+                        "prompt_eval_count": prompt_tokens,
+                        "eval_count": len(tokens),
+                        "eval_duration": max(int(len(tokens) * server.token_latency * 1e9), 1),
+                    }
+
+                if not request.get("stream", True):
+                    time.sleep(len(tokens) * server.token_latency)
+                    self._send_json({**final(), "response": reply})
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for index, token in enumerate(tokens):
+                    time.sleep(server.token_latency)
+                    self._write_chunk({**base, "response": token if index == 0 else " " + token, "done": False})
+                self._write_chunk(final())
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug(format % args)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def start(self) -> "FakeOllamaServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a fake Ollama API.")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-latency", type=float, default=0.02, help="Seconds per generated token.")
+    parser.add_argument("--prompt-token-latency", type=float, default=0.0, help="Seconds per prompt token.")
+    args = parser.parse_args()
+    server = FakeOllamaServer(port=args.port, token_latency=args.token_latency, prompt_token_latency=args.prompt_token_latency)
+    logger.info(f"Serving fake Ollama at {server.url}")
+    server.serve_forever()
@@ -0,0 +1,80 @@
+import argparse
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+import ollama
+import llm_clients
+from benchmarks.fake_ollama import FakeOllamaServer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+PROMPT = "You are a polite chatbot. Provide a short and sweet answer to the following query:\nTell me a joke"
+
+def _time_calls(call: Callable[[str], str], requests: int, concurrency: int) -> List[float]:
+    def timed(index: int) -> float:
+        start = time.perf_counter()
+        # Distinct prompts, so the shared client does not coalesce requests into one call
+        call(f"{PROMPT} #{index}")
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(timed, range(requests)))
+
+def run(requests: int, concurrency: int, token_latency: float = 0.02) -> Dict[str, float]:
+    """
+    Compare a new Ollama client per request with the shared llm_clients registry,
+    then measure time to first token and total latency of streamed responses.
+
+    Args:
+        requests (int): Requests per mode.
+        concurrency (int): Parallel callers.
+        token_latency (float): Seconds per generated token in the streaming measurement.
+
+    Returns:
+        Dict[str, float]: Median latencies and HTTP connections opened for each mode.
+    """
+    stats: Dict[str, float] = {}
+    with FakeOllamaServer() as server:
+        per_call = _time_calls(
+            lambda prompt: ollama.Client(host=server.url).generate(model="llama3.1", prompt=prompt)["response"],
+            requests,
+            concurrency,
+        )
+        stats["per_call_client_p50"] = statistics.median(per_call)
+        stats["per_call_client_connections"] = server.connections
+
+        server.connections = 0
+        llm_clients.OLLAMA_CONFIG["host"] = server.url
+        llm_clients.LLM_CONCURRENCY["llama3.1"] = concurrency
+        llm_clients.reset_llm_clients()
+        shared = _time_calls(lambda prompt: llm_clients.get_llm_client("llama3.1").generate(prompt), requests, concurrency)
+        stats["shared_client_p50"] = statistics.median(shared)
+        stats["shared_client_connections"] = server.connections
+
+        server.token_latency = token_latency
+        streams: List[llm_clients.TimedStream] = []
+        for _ in range(10):
+            stream = llm_clients.TimedStream(llm_clients.get_llm_client("llama3.1").stream(PROMPT))
+            "".join(stream)
+            streams.append(stream)
+        stats["stream_ttft_p50"] = statistics.median(stream.time_to_first_token for stream in streams)
+        stats["stream_total_p50"] = statistics.median(stream.total_time for stream in streams)
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark LLM client reuse against a fake Ollama server.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--token-latency", type=float, default=0.02, help="Seconds per generated token when streaming.")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    stats = run(args.requests, args.concurrency, args.token_latency)
+    logger.info(
+        f"Per-call client: p50 {stats['per_call_client_p50'] * 1000:.2f}ms over {stats['per_call_client_connections']} connections, "
+        f"shared client: p50 {stats['shared_client_p50'] * 1000:.2f}ms over {stats['shared_client_connections']} connections"
+    )
+    logger.info(f"Streaming: time to first token p50 {stats['stream_ttft_p50'] * 1000:.1f}ms, total p50 {stats['stream_total_p50'] * 1000:.1f}ms")
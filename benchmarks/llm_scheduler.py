@@ -0,0 +1,121 @@
+import argparse
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+import llm_clients
+import llm_scheduler
+from benchmarks.fake_ollama import FakeOllamaServer
+from benchmarks.stats import write_report
+from llm_scheduler import LLMQueueFull
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+MODEL = "llama3.2"
+SHORT_PROMPT = "Tell me a joke"
+LONG_PROMPT = " ".join(["Summarize the following scraped result about the stock market."] * 100)
+
+def _burst(long_requests: int, short_requests: int) -> Tuple[List[float], List[float], int]:
+    """Send long prompts, then short ones right behind them; return per-kind latencies and rejections."""
+    client = llm_clients.get_llm_client(MODEL)
+    short: List[float] = []
+    long: List[float] = []
+    rejected = 0
+    lock = threading.Lock()
+
+    def call(index: int, prompt: str, latencies: List[float]) -> None:
+        nonlocal rejected
+        start = time.perf_counter()
+        try:
+            # Distinct prompts, so requests are not coalesced
+            client.generate(f"{prompt} #{index}")
+        except LLMQueueFull:
+            with lock:
+                rejected += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=long_requests + short_requests) as executor:
+        for index in range(long_requests):
+            executor.submit(call, index, LONG_PROMPT, long)
+        time.sleep(0.05)
+        for index in range(short_requests):
+            executor.submit(call, index, SHORT_PROMPT, short)
+    return short, long, rejected
+
+def run(long_requests: int, short_requests: int, concurrency: int, prompt_token_latency: float, token_latency: float) -> Dict[str, Dict[str, float]]:
+    """
+    Drive bursts of mixed prompts through the scheduler against a fake Ollama server.
+
+    Compares FIFO with short-prompt priority, shows backpressure with a small
+    queue, and counts Ollama calls for a burst of identical prompts.
+
+    Args:
+        long_requests (int): Long prompts per burst, sent first.
+        short_requests (int): Short prompts per burst, sent right after.
+        concurrency (int): Requests per model in flight at once.
+        prompt_token_latency (float): Seconds per prompt token (prefill) on the fake Ollama server.
+        token_latency (float): Seconds per generated token on the fake Ollama server.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Latencies, rejections and Ollama calls per scenario.
+    """
+    saved_host = llm_clients.OLLAMA_CONFIG["host"]
+    saved_concurrency = dict(llm_clients.LLM_CONCURRENCY)
+    saved_config = dict(llm_scheduler.LLM_SCHEDULER_CONFIG)
+    report: Dict[str, Dict[str, float]] = {}
+    try:
+        with FakeOllamaServer(token_latency=token_latency, prompt_token_latency=prompt_token_latency) as server:
+            llm_clients.OLLAMA_CONFIG["host"] = server.url
+            llm_clients.LLM_CONCURRENCY[MODEL] = concurrency
+            scenarios = {
+                # Every prompt counts as short, so requests are served first come, first served
+                "fifo": {"short_prompt_words": 10 ** 9, "max_queue": 1000},
+                "priority": {"short_prompt_words": saved_config["short_prompt_words"], "max_queue": 1000},
+                "backpressure": {"short_prompt_words": saved_config["short_prompt_words"], "max_queue": concurrency * 2},
+            }
+            for name, config in scenarios.items():
+                llm_scheduler.LLM_SCHEDULER_CONFIG.update(config)
+                llm_clients.reset_llm_clients()
+                short, long, rejected = _burst(long_requests, short_requests)
+                report[name] = {
+                    "short_p50": statistics.median(short) if short else 0.0,
+                    "long_p50": statistics.median(long) if long else 0.0,
+                    "rejected": rejected,
+                }
+
+            llm_clients.reset_llm_clients()
+            client = llm_clients.get_llm_client(MODEL)
+            calls_before = server.requests
+            with ThreadPoolExecutor(max_workers=short_requests) as executor:
+                list(executor.map(lambda _: client.generate(SHORT_PROMPT), range(short_requests)))
+            report["identical_prompts"] = {
+                "requests": short_requests,
+                "ollama_calls": server.requests - calls_before,
+                "coalesced": client.stats()["coalesced"],
+            }
+    finally:
+        llm_clients.OLLAMA_CONFIG["host"] = saved_host
+        llm_clients.LLM_CONCURRENCY.clear()
+        llm_clients.LLM_CONCURRENCY.update(saved_concurrency)
+        llm_scheduler.LLM_SCHEDULER_CONFIG.update(saved_config)
+        llm_clients.reset_llm_clients()
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the LLM request scheduler against a fake Ollama server.")
+    parser.add_argument("--long", type=int, default=8, help="Long prompts per burst.")
+    parser.add_argument("--short", type=int, default=8, help="Short prompts per burst.")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--prompt-token-latency", type=float, default=0.0005, help="Seconds per prompt token.")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="Seconds per generated token.")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of logging it.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run(args.long, args.short, args.concurrency, args.prompt_token_latency, args.token_latency)
+    write_report(report, args.output)
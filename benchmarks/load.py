@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+from async_pipeline import BACKEND_CONCURRENCY, handle_query_async, speculation_stats
+from benchmarks.stand_ins import local_backends
+from benchmarks.stats import latency_summary, write_report
+from query_classifier import get_classifier
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+ROUTE_QUERIES: Dict[str, str] = {
+    "static": "Tell me a joke",
+    "dynamic": "What is the weather today?",
+    "sql": "Show me all the users of the database",
+}
+
+async def _drive(users: int, requests: int) -> Tuple[List[Tuple[str, float]], float, int]:
+    model = get_classifier()
+    gate = asyncio.Semaphore(users)
+    latencies: List[Tuple[str, float]] = []
+    failures = 0
+
+    async def one(index: int) -> None:
+        nonlocal failures
+        route = list(ROUTE_QUERIES)[index % len(ROUTE_QUERIES)]
+        # Tag each request so static and dynamic queries miss the response caches
+        query = ROUTE_QUERIES[route] if route == "sql" else f"{ROUTE_QUERIES[route]} request{index}"
+        async with gate:
+            start = time.perf_counter()
+            try:
+                await handle_query_async(query, model)
+            except Exception as e:
+                failures += 1
+                logger.warning(f"Request {index} failed: {e!r}")
+            latencies.append((route, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    return latencies, time.perf_counter() - start, failures
+
+def run(users: int, requests: int, token_latency: float) -> Dict:
+    """
+    Drive concurrent queries through the async pipeline against local stand-ins.
+
+    Args:
+        users (int): Simultaneous in-flight queries.
+        requests (int): Total queries, spread evenly over the routes.
+        token_latency (float): Seconds per generated token on the fake Ollama server.
+
+    Returns:
+        Dict: Throughput and latency percentiles, overall and per route, and speculative routing counters.
+    """
+    with local_backends(token_latency=token_latency):
+        latencies, elapsed, failures = asyncio.run(_drive(users, requests))
+    by_route: Dict[str, List[float]] = defaultdict(list)
+    for route, latency in latencies:
+        by_route[route].append(latency)
+    return {
+        "users": users,
+        "requests": requests,
+        "failures": failures,
+        "throughput_qps": requests / elapsed,
+        "backend_concurrency": dict(BACKEND_CONCURRENCY),
+        "overall": latency_summary([latency for _, latency in latencies]),
+        "routes": {route: latency_summary(values) for route, values in by_route.items()},
+        "speculation": speculation_stats(),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the async pipeline against local stand-ins.")
+    parser.add_argument("--users", type=int, default=16, help="Simultaneous queries.")
+    parser.add_argument("--requests", type=int, default=300, help="Total queries.")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="Seconds per generated token.")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of logging it.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run(args.users, args.requests, args.token_latency)
+    write_report(report, args.output)
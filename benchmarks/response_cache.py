@@ -0,0 +1,59 @@
+import argparse
+import logging
+import time
+from typing import Dict, List
+import response_cache
+from benchmarks.stand_ins import local_backends
+from benchmarks.stats import write_report
+from llm_processor import get_static_response
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+# Static queries as users phrase them: repeats, case/punctuation variants and near duplicates
+STATIC_TRAFFIC: List[str] = [
+    "Tell me a joke",
+    "tell me a joke!",
+    "What is the capital of France?",
+    "what is the capital of france",
+    "What's the capital of France?",
+    "What is the capital of Japan?",
+    "What is the capital of Germany?",
+    "How do I bake a cake?",
+    "How do I bake a cake",
+    "How can I bake a cake?",
+    "What is langchain?",
+    "What is LangChain",
+    "How do I make tea?",
+    "how do i make tea",
+]
+
+def run(rounds: int, token_latency: float) -> Dict[str, float]:
+    """
+    Replay static traffic through the semantic response cache against a fake Ollama server.
+
+    Args:
+        rounds (int): Passes over STATIC_TRAFFIC.
+        token_latency (float): Seconds per generated token on the fake Ollama server.
+
+    Returns:
+        Dict[str, float]: Cache counters, LLM calls made and wall time.
+    """
+    with local_backends(token_latency=token_latency) as stand_ins:
+        cache = response_cache.get_response_cache()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for query in STATIC_TRAFFIC:
+                cache.get_or_compute(query, lambda: get_static_response(query))
+        elapsed = time.perf_counter() - start
+        return {**cache.stats(), "llm_calls": stand_ins.ollama.requests, "queries": rounds * len(STATIC_TRAFFIC), "wall_time": elapsed}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure static response cache hit rate and latency saved.")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--token-latency", type=float, default=0.02)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of logging it.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    write_report(run(args.rounds, args.token_latency), args.output)
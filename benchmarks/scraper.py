@@ -0,0 +1,123 @@
+import argparse
+import logging
+import statistics
+import time
+from typing import Dict, List, Optional
+from benchmarks.fake_google import FakeGoogleServer, load_pages
+from web_scraper import RESULTS_PER_PAGE, DriverPool, HttpBackend, ScraperBackend, SeleniumBackend, scrape, scrape_many
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+QUERIES: List[str] = [
+    "What is the weather today?",
+    "USD rate in INR",
+    "Latest news updates",
+    "Current stock prices",
+]
+
+def _time_scrapes(backend: ScraperBackend, search_url: str, rounds: int) -> List[float]:
+    latencies: List[float] = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            results, _, _ = scrape(query, search_url=search_url, backends=[backend])
+            latencies.append(time.perf_counter() - start)
+            if not results:
+                raise AssertionError(f"No results scraped for {query!r} with {backend.name} backend")
+    return latencies
+
+def run(rounds: int, pages: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Compare scraping strategies on the fake Google server.
+
+    Measures a fresh browser per scrape, a warm driver pool, and the HTTP backend.
+
+    Args:
+        rounds (int): Passes over QUERIES for each mode.
+        pages (Optional[List[str]]): Saved result pages to serve instead of generated ones.
+
+    Returns:
+        Dict[str, float]: Median scrape latency in seconds for each mode.
+    """
+    with FakeGoogleServer(pages=pages) as server:
+        fresh_pool = DriverPool(max_size=1, max_uses=1)
+        fresh = _time_scrapes(SeleniumBackend(fresh_pool), server.url, rounds)
+        fresh_pool.close()
+
+        warm_pool = DriverPool(max_size=1)
+        warm_pool.warm()
+        pooled = _time_scrapes(SeleniumBackend(warm_pool), server.url, rounds)
+        warm_pool.close()
+
+        http = _time_scrapes(HttpBackend(), server.url, rounds)
+    return {
+        "fresh_browser_p50": statistics.median(fresh),
+        "pooled_browser_p50": statistics.median(pooled),
+        "http_p50": statistics.median(http),
+    }
+
+def run_fanout(rounds: int, pages: int, delay: float, browser: bool = False) -> Dict[str, float]:
+    """
+    Compare fetching every result page of QUERIES one by one against scrape_many().
+
+    Args:
+        rounds (int): Repetitions of each mode.
+        pages (int): Result pages per query.
+        delay (float): Seconds the fake Google server takes per results page.
+        browser (bool): Use a warm pool of Chrome sessions instead of the HTTP backend.
+
+    Returns:
+        Dict[str, float]: Median wall time of each mode and the unique results found.
+    """
+    pool: Optional[DriverPool] = None
+    if browser:
+        pool = DriverPool(max_size=4)
+        pool.warm()
+    backend: ScraperBackend = SeleniumBackend(pool) if pool is not None else HttpBackend()
+    serial: List[float] = []
+    fanout: List[float] = []
+    unique_results = 0
+    with FakeGoogleServer(delay=delay) as server:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for query in QUERIES:
+                for page in range(pages):
+                    backend.search_page(query, server.url, page * RESULTS_PER_PAGE)
+            serial.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            results, _, _ = scrape_many(QUERIES, pages=pages, search_url=server.url, backends=[backend])
+            fanout.append(time.perf_counter() - start)
+            unique_results = len(results)
+    if pool is not None:
+        pool.close()
+    return {
+        "serial_p50": statistics.median(serial),
+        "fanout_p50": statistics.median(fanout),
+        "unique_results": unique_results,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark scraping against a local fake Google.")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--pages", help="Directory of saved result pages (*.html) to serve.")
+    parser.add_argument("--fanout", action="store_true", help="Compare serial page fetches with scrape_many() instead.")
+    parser.add_argument("--fanout-pages", type=int, default=2, help="Result pages per query in --fanout mode.")
+    parser.add_argument("--delay", type=float, default=0.05, help="Fake server latency per results page in --fanout mode.")
+    parser.add_argument("--browser", action="store_true", help="Use pooled Chrome sessions in --fanout mode.")
+    args = parser.parse_args()
+    if args.fanout:
+        stats = run_fanout(args.rounds, args.fanout_pages, args.delay, args.browser)
+        logger.info(
+            f"{len(QUERIES)} queries x {args.fanout_pages} pages: serial p50 {stats['serial_p50']:.3f}s, "
+            f"fan-out p50 {stats['fanout_p50']:.3f}s, {stats['unique_results']} unique results"
+        )
+    else:
+        stats = run(args.rounds, load_pages(args.pages) if args.pages else None)
+        logger.info(
+            f"Fresh browser p50: {stats['fresh_browser_p50']:.3f}s, "
+            f"pooled browser p50: {stats['pooled_browser_p50']:.3f}s, "
+            f"HTTP p50: {stats['http_p50']:.3f}s"
+        )
@@ -0,0 +1,60 @@
+import argparse
+import logging
+import time
+from typing import Dict, List
+from benchmarks.stand_ins import local_backends
+from benchmarks.stats import latency_summary, write_report
+from db_handler import DB_SCHEMA, generate_sql_query, resolve_sql_query
+from query_classifier import TRAINING_DATA
+from sql_templates import match_sql_template
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+def run(rounds: int, token_latency: float) -> Dict[str, Dict[str, float]]:
+    """
+    Resolve the SQL training queries to SQL with and without the template fast path.
+
+    Args:
+        rounds (int): Passes over the SQL queries in TRAINING_DATA.
+        token_latency (float): Seconds per generated token on the fake Ollama server.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Share of queries served by templates and latency per path.
+    """
+    queries = [query for query, label in TRAINING_DATA if label == "sql"]
+    served = [query for query in queries if match_sql_template(query, DB_SCHEMA) is not None]
+    llm_only: List[float] = []
+    with_templates: List[float] = []
+    with local_backends(token_latency=token_latency) as stand_ins:
+        for _ in range(rounds):
+            for query in queries:
+                start = time.perf_counter()
+                generate_sql_query(query, DB_SCHEMA)
+                llm_only.append(time.perf_counter() - start)
+        llm_calls = stand_ins.ollama.requests
+        for _ in range(rounds):
+            for query in queries:
+                start = time.perf_counter()
+                resolve_sql_query(query, DB_SCHEMA)
+                with_templates.append(time.perf_counter() - start)
+        template_llm_calls = stand_ins.ollama.requests - llm_calls
+    return {
+        "traffic": {
+            "queries": len(queries),
+            "served_by_template": len(served),
+            "template_fraction": len(served) / len(queries),
+        },
+        "llm_only": {**latency_summary(llm_only), "llm_calls": llm_calls},
+        "with_templates": {**latency_summary(with_templates), "llm_calls": template_llm_calls},
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare SQL resolution through templates against the LLM.")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of logging it.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    write_report(run(args.rounds, args.token_latency), args.output)
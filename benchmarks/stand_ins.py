@@ -0,0 +1,92 @@
+import logging
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple
+import db_handler
+import llm_clients
+import web_scraper
+from benchmarks.fake_google import FakeGoogleServer
+from benchmarks.fake_ollama import FakeOllamaServer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+SAMPLE_DATA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR(100), email VARCHAR(100))",
+    "CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(100), price DECIMAL(10, 2))",
+    "CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INT, product_id INT, quantity INT)",
+]
+
+def fake_sql_reply(prompt: str) -> str:
+    """Reply of the fake Ollama server: valid SQL for SQL prompts, canned prose otherwise."""
+    if "convert natural language into SQL" in prompt:
+        return "SELECT * FROM users"
+    return "This is a canned answer from the fake Ollama server."
+
+def create_sample_database(pool_size: int = 5, rows: int = 100) -> db_handler.SQLiteConnectionPool:
+    """
+    Create an in-memory SQLite database with the DB_SCHEMA tables and sample rows.
+
+    Args:
+        pool_size (int): Connections in the returned pool.
+        rows (int): Rows per table.
+
+    Returns:
+        db_handler.SQLiteConnectionPool: Pool over the seeded database.
+    """
+    pool = db_handler.SQLiteConnectionPool(pool_size=pool_size)
+    connection = pool.get_connection()
+    cursor = connection.cursor()
+    for statement in SAMPLE_DATA:
+        cursor.execute(statement)
+    for index in range(1, rows + 1):
+        cursor.execute("INSERT INTO users VALUES (%s, %s, %s)", (index, f"user{index}", f"user{index}@example.com"))
+        cursor.execute("INSERT INTO products VALUES (%s, %s, %s)", (index, f"product{index}", index * 10.0))
+        cursor.execute("INSERT INTO orders VALUES (%s, %s, %s, %s)", (index, index, (index * 7) % rows + 1, index % 5 + 1))
+    connection.commit()
+    cursor.close()
+    connection.close()
+    return pool
+
+class StandIns(NamedTuple):
+    google: FakeGoogleServer
+    ollama: FakeOllamaServer
+    database: db_handler.SQLiteConnectionPool
+
+@contextmanager
+def local_backends(token_latency: float = 0.01, prompt_token_latency: float = 0.0, search_delay: float = 0.0) -> Iterator[StandIns]:
+    """
+    Point the router at local stand-ins for Google, Ollama and MySQL.
+
+    Scraping uses the HTTP backend only, so no browser is needed. Module
+    configuration is restored on exit.
+
+    Args:
+        token_latency (float): Seconds per generated token on the fake Ollama server.
+        prompt_token_latency (float): Seconds per prompt token on the fake Ollama server.
+        search_delay (float): Seconds the fake Google server takes per results page.
+
+    Yields:
+        StandIns: Running stand-in servers and the database pool.
+    """
+    saved_search_url = web_scraper.SEARCH_URL
+    saved_backends = list(web_scraper.SCRAPER_BACKENDS)
+    saved_host = llm_clients.OLLAMA_CONFIG["host"]
+    saved_pool = db_handler._connection_pool
+    with FakeGoogleServer(delay=search_delay) as google, \
+            FakeOllamaServer(reply=fake_sql_reply, token_latency=token_latency, prompt_token_latency=prompt_token_latency) as ollama:
+        web_scraper.SEARCH_URL = google.url
+        web_scraper.SCRAPER_BACKENDS[:] = ["http"]
+        llm_clients.OLLAMA_CONFIG["host"] = ollama.url
+        llm_clients.reset_llm_clients()
+        database = create_sample_database()
+        db_handler.set_connection_pool(database)
+        try:
+            yield StandIns(google, ollama, database)
+        finally:
+            web_scraper.SEARCH_URL = saved_search_url
+            web_scraper.SCRAPER_BACKENDS[:] = saved_backends
+            llm_clients.OLLAMA_CONFIG["host"] = saved_host
+            llm_clients.reset_llm_clients()
+            if saved_pool is not None:
+                db_handler.set_connection_pool(saved_pool)
@@ -0,0 +1,52 @@
+import argparse
+import logging
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+from benchmarks.stats import write_report
+from startup import ROUTE_MODULES, profile_entry_point
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+# Work done before the first widget is drawn, timed in a fresh interpreter
+LAZY_STARTUP = "import main"
+# What main.py did before lazy loading: import every backend and load the classifier up front
+EAGER_STARTUP = "import main, {modules}; from query_classifier import get_classifier; get_classifier()".format(
+    modules=", ".join(sorted({module for modules in ROUTE_MODULES.values() for module in modules}))
+)
+
+def _time_in_fresh_interpreter(code: str) -> float:
+    script = f"import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)"
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return float(completed.stdout.strip().splitlines()[-1])
+
+def run(runs: int) -> Dict[str, object]:
+    """
+    Compare time to first render of the Streamlit entry point with lazy and eager backend loading.
+
+    Args:
+        runs (int): Fresh interpreters started per mode.
+
+    Returns:
+        Dict[str, object]: Median startup seconds per mode and the slowest imports of main.
+    """
+    report: Dict[str, object] = {}
+    for name, code in (("lazy", LAZY_STARTUP), ("eager", EAGER_STARTUP)):
+        timings: List[float] = [_time_in_fresh_interpreter(code) for _ in range(runs)]
+        report[f"{name}_startup_p50"] = statistics.median(timings)
+    report["slowest_imports"] = [
+        {"module": module, "self": self_time, "cumulative": cumulative}
+        for module, self_time, cumulative in profile_entry_point("main", top=10)
+    ]
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure Streamlit entry point startup time.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON report to this file instead of logging it.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    write_report(run(args.runs), args.output)
@@ -0,0 +1,48 @@
+import json
+import logging
+import statistics
+from typing import Dict, Optional, Sequence
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+# Reports are shown even when a benchmark quiets the modules it measures
+logger.setLevel(logging.INFO)
+
+def latency_summary(latencies: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize latencies in seconds.
+
+    Args:
+        latencies (Sequence[float]): Measured latencies.
+
+    Returns:
+        Dict[str, float]: Count, mean, p50, p95, p99 and max.
+    """
+    if len(latencies) < 2:
+        value = latencies[0] if latencies else 0.0
+        return {"count": len(latencies), "mean": value, "p50": value, "p95": value, "p99": value, "max": value}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "count": len(latencies),
+        "mean": statistics.fmean(latencies),
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "max": max(latencies),
+    }
+
+def write_report(report: Dict, output: Optional[str] = None) -> None:
+    """
+    Write a benchmark report as JSON to a file, or log it when no file is given.
+
+    Args:
+        report (Dict): JSON-serializable benchmark results.
+        output (Optional[str]): Path of the JSON file to write.
+    """
+    if output:
+        with open(output, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+        logger.info(f"Report written to {output}")
+    else:
+        logger.info(f"Report:\n{json.dumps(report, indent=2)}")
@@ -0,0 +1,318 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+CONVERSATION_CONFIG = {
+    # Sessions kept in memory; the least recently used are evicted beyond this
+    "max_sessions": 1000,
+    # Seconds without a new turn after which a session is forgotten
+    "idle_timeout": 1800.0,
+    # Turns kept verbatim per session; older ones are folded into the summary
+    "max_turns": 8,
+    # Approximate tokens kept of each question and answer
+    "turn_tokens": 120,
+    # Approximate tokens of the folded summary
+    "summary_tokens": 120,
+    # Approximate tokens of history inserted into a prompt
+    "history_tokens": 400,
+    # SQLite file keeping sessions across restarts and memory evictions, or None
+    "db_path": None,
+    # Idle sessions are swept from memory and disk every this many appends
+    "sweep_every": 100,
+}
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+_WORD = re.compile(r"[a-z']+")
+
+# Opening words of questions that continue the previous one ("what about Germany?")
+_FOLLOW_UP_OPENERS = (
+    "and", "but", "also", "so", "then", "what about", "how about", "why", "why not", "what else",
+    "tell me more", "more", "another", "again", "same", "ok", "okay",
+)
+# Words that refer back to something said earlier
+_REFERRING_WORDS = frozenset(
+    "it its it's they them their theirs that those these this he him his she her one ones another else "
+    "former latter above previous same".split()
+)
+
+def is_follow_up(query: str) -> bool:
+    """
+    Whether a query seems to build on the previous turn and needs the conversation to be answered.
+
+    Follow-ups open with a continuation ("what about ...", "and ..."), refer back
+    with a pronoun ("how old is he?"), or are elliptical fragments of one or two
+    words ("Germany?"). Other queries are answered on their own, so they can
+    still be served from the response caches.
+
+    Args:
+        query (str): User query.
+
+    Returns:
+        bool: True if conversation history should be added to the prompt.
+    """
+    words = _WORD.findall(query.lower().replace("’", "'"))
+    if not words:
+        return False
+    text = " ".join(words)
+    if len(words) <= 2 or any(text == opener or text.startswith(f"{opener} ") for opener in _FOLLOW_UP_OPENERS):
+        return True
+    return any(word in _REFERRING_WORDS for word in words)
+
+class Turn(NamedTuple):
+    """One compacted question and answer."""
+
+    query: str
+    answer: str
+
+def _tokens(text: str) -> int:
+    return len(_TOKEN.findall(text))
+
+def _compact(text: str, max_tokens: int) -> str:
+    """Collapse whitespace and cut text to about max_tokens."""
+    text = " ".join(text.split())
+    tokens = list(_TOKEN.finditer(text))
+    if len(tokens) <= max_tokens:
+        return text
+    return f"{text[:tokens[max_tokens - 1].end()]}..."
+
+def _summarize(turn: Turn, max_tokens: int) -> str:
+    """Extractive one-line summary of a turn: the question and the first sentence of the answer."""
+    first_sentence = _SENTENCE_END.split(turn.answer, maxsplit=1)[0]
+    return _compact(f"{turn.query} -> {first_sentence}", max_tokens)
+
+class _Session:
+    """Recent turns and a summary of older ones."""
+
+    __slots__ = ("turns", "summary", "last_used")
+
+    def __init__(self, turns: Iterable[Turn] = (), summary: Iterable[str] = (), last_used: float = 0.0):
+        self.turns: Deque[Turn] = deque(turns)
+        self.summary: List[str] = list(summary)
+        self.last_used = last_used
+
+class ConversationStore:
+    """
+    Bounded per-session conversation memory.
+
+    Each session keeps its last max_turns turns, compacted to turn_tokens per
+    question and answer; older turns are folded into a short extractive summary.
+    history() renders the newest turns that fit a token budget, so prompts grow
+    with neither conversation length nor answer size. Sessions idle for longer
+    than idle_timeout are dropped, and beyond max_sessions the least recently
+    used are evicted from memory. With db_path, sessions are also written to
+    SQLite and reloaded after an eviction or restart; every sweep_every appends,
+    idle sessions are swept from both.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        idle_timeout: float = 1800.0,
+        max_turns: int = 8,
+        turn_tokens: int = 120,
+        summary_tokens: int = 120,
+        history_tokens: int = 400,
+        db_path: Optional[str] = None,
+        sweep_every: int = 100,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_turns = max_turns
+        self.turn_tokens = turn_tokens
+        self.summary_tokens = summary_tokens
+        self.history_tokens = history_tokens
+        self.sweep_every = sweep_every
+        self._appends = 0
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS conversations "
+                "(session_id TEXT PRIMARY KEY, last_used REAL, summary TEXT, turns TEXT)"
+            )
+            self._db.commit()
+
+    def _load(self, session_id: str, now: float) -> Optional[_Session]:
+        """Find a live session in memory or on disk. Caller must hold the lock."""
+        session = self._sessions.get(session_id)
+        if session is None and self._db is not None:
+            row = self._db.execute(
+                "SELECT last_used, summary, turns FROM conversations WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is not None:
+                session = _Session((Turn(*turn) for turn in json.loads(row[2])), json.loads(row[1]), row[0])
+                self._sessions[session_id] = session
+        if session is None:
+            return None
+        if now - session.last_used > self.idle_timeout:
+            self._drop(session_id)
+            self.expirations += 1
+            return None
+        self._sessions.move_to_end(session_id)
+        self._trim()
+        return session
+
+    def _trim(self) -> None:
+        """Evict least recently used sessions beyond max_sessions from memory. Caller must hold the lock."""
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    def _sweep(self, now: float) -> int:
+        """Drop sessions idle for longer than idle_timeout from memory and disk. Caller must hold the lock."""
+        cutoff = now - self.idle_timeout
+        expired = [session_id for session_id, session in self._sessions.items() if session.last_used < cutoff]
+        for session_id in expired:
+            self._sessions.pop(session_id)
+        dropped = len(expired)
+        if self._db is not None:
+            # Every session is written through, so this also covers the ones evicted from memory
+            dropped = self._db.execute("DELETE FROM conversations WHERE last_used < ?", (cutoff,)).rowcount
+            self._db.commit()
+        self.expirations += dropped
+        return dropped
+
+    def _drop(self, session_id: str) -> None:
+        """Forget a session everywhere. Caller must hold the lock."""
+        self._sessions.pop(session_id, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM conversations WHERE session_id = ?", (session_id,))
+            self._db.commit()
+
+    def _persist(self, session_id: str, session: _Session) -> None:
+        """Write a session through to disk. Caller must hold the lock."""
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO conversations (session_id, last_used, summary, turns) VALUES (?, ?, ?, ?)",
+                (session_id, session.last_used, json.dumps(session.summary), json.dumps(list(session.turns))),
+            )
+            self._db.commit()
+
+    def append(self, session_id: str, query: str, answer: str) -> None:
+        """
+        Record a turn of a session.
+
+        Args:
+            session_id (str): Streamlit session ID.
+            query (str): User query.
+            answer (str): Response shown to the user.
+        """
+        now = time.time()
+        with self._lock:
+            session = self._load(session_id, now)
+            if session is None:
+                session = self._sessions[session_id] = _Session()
+            session.turns.append(Turn(_compact(query, self.turn_tokens), _compact(answer, self.turn_tokens)))
+            while len(session.turns) > self.max_turns:
+                session.summary.append(_summarize(session.turns.popleft(), self.summary_tokens))
+            while len(session.summary) > 1 and _tokens(" ".join(session.summary)) > self.summary_tokens:
+                session.summary.pop(0)
+            session.last_used = now
+            self._persist(session_id, session)
+            self._trim()
+            self._appends += 1
+            if self._appends % self.sweep_every == 0:
+                self._sweep(now)
+
+    def history(self, session_id: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Render a session's conversation for a prompt.
+
+        The newest turns are kept first; the summary of older turns is included
+        if it still fits the budget.
+
+        Args:
+            session_id (str): Streamlit session ID.
+            max_tokens (Optional[int]): Token budget. Defaults to history_tokens.
+
+        Returns:
+            str: Conversation text, or an empty string for a new session.
+        """
+        budget = max_tokens or self.history_tokens
+        with self._lock:
+            session = self._load(session_id, time.time())
+            if session is None:
+                return ""
+            turns = list(session.turns)
+            summary = list(session.summary)
+
+        lines: List[str] = []
+        used = 0
+        for turn in reversed(turns):
+            block = f"User: {turn.query}\nAssistant: {turn.answer}"
+            cost = _tokens(block)
+            if used + cost > budget:
+                break
+            lines.insert(0, block)
+            used += cost
+        if summary and len(lines) == len(turns):
+            summary_text = f"Earlier: {'; '.join(summary)}"
+            if used + _tokens(summary_text) <= budget:
+                lines.insert(0, summary_text)
+        return "\n".join(lines)
+
+    def clear(self, session_id: str) -> None:
+        """
+        Forget a session.
+
+        Args:
+            session_id (str): Streamlit session ID.
+        """
+        with self._lock:
+            self._drop(session_id)
+
+    def evict_idle(self) -> int:
+        """
+        Drop sessions idle for longer than idle_timeout.
+
+        Returns:
+            int: Number of sessions dropped.
+        """
+        with self._lock:
+            return self._sweep(time.time())
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Store counters.
+
+        Returns:
+            Dict[str, int]: Sessions and turns in memory, LRU evictions and idle expirations.
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "turns": sum(len(session.turns) for session in self._sessions.values()),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+_store_lock = threading.Lock()
+_conversation_store: Optional[ConversationStore] = None
+
+def get_conversation_store() -> ConversationStore:
+    """
+    Return the process-wide conversation store shared by all Streamlit sessions.
+
+    Returns:
+        ConversationStore: Shared store configured from CONVERSATION_CONFIG.
+    """
+    global _conversation_store
+    if _conversation_store is None:
+        with _store_lock:
+            if _conversation_store is None:
+                _conversation_store = ConversationStore(**CONVERSATION_CONFIG)
+    return _conversation_store
@@ -1,7 +1,16 @@
+import itertools
 import logging
-from typing import Union, List, Dict
+import sqlite3
+import threading
+from contextlib import contextmanager
+from queue import Queue
+from typing import Any, Iterator, Optional, Sequence, Tuple, Union, List, Dict
 import mysql.connector
-from langchain.llms import Ollama
+from mysql.connector import pooling
+from llm_clients import get_llm_client
+from metrics import METRICS
+from sql_templates import match_sql_template
+from sql_cache import get_sql_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -14,6 +23,165 @@ DB_CONFIG = {
     "database": "sample_db",
 }
 
+SQL_MODEL = "llama3.2"
+
+DB_SCHEMA = """
+Tables:
+users (id INT, name VARCHAR, email VARCHAR)
+products (id INT, name VARCHAR, price DECIMAL)
+orders (id INT, user_id INT, product_id INT, quantity INT)
+"""
+
+DB_POOL_CONFIG = {
+    "pool_name": "router_pool",
+    "pool_size": 5,
+}
+
+# Maximum number of rows handed to the UI for a single query
+DB_ROW_CAP = 1000
+
+class _SQLiteCursor:
+    """Cursor wrapper giving sqlite3 the subset of the MySQL cursor API used here."""
+
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    @property
+    def with_rows(self) -> bool:
+        return self._cursor.description is not None
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def _rows(self, rows: List[tuple]) -> List[Any]:
+        if not self._dictionary:
+            return rows
+        columns = [column[0] for column in self._cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+
+    def execute(self, operation: str, params: Optional[Sequence[Any]] = None) -> None:
+        # MySQL placeholders are %s, SQLite's are ?
+        try:
+            self._cursor.execute(operation.replace("%s", "?"), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise mysql.connector.Error(msg=str(e)) from e
+
+    def fetchone(self) -> Optional[Any]:
+        row = self._cursor.fetchone()
+        return None if row is None else self._rows([row])[0]
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        return self._rows(self._cursor.fetchmany(size))
+
+    def fetchall(self) -> List[Any]:
+        return self._rows(self._cursor.fetchall())
+
+    def close(self) -> None:
+        self._cursor.close()
+
+class _SQLiteConnection:
+    """Pooled sqlite3 connection; close() hands it back to its pool."""
+
+    def __init__(self, connection: sqlite3.Connection, pool: "SQLiteConnectionPool"):
+        self._connection = connection
+        self._pool = pool
+
+    def cursor(self, dictionary: bool = False, buffered: Optional[bool] = None) -> _SQLiteCursor:
+        return _SQLiteCursor(self._connection.cursor(), dictionary)
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def rollback(self) -> None:
+        self._connection.rollback()
+
+    def consume_results(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._connection.rollback()
+        self._pool._connections.put(self._connection)
+
+class SQLiteConnectionPool:
+    """
+    SQLite-backed stand-in for mysql.connector's MySQLConnectionPool.
+
+    Lets the SQL route run against a local database, e.g. in benchmarks:
+    `set_connection_pool(SQLiteConnectionPool("sample.db"))`.
+    """
+
+    _memory_ids = itertools.count()
+
+    def __init__(self, database: str = ":memory:", pool_size: int = 5):
+        self.pool_size = pool_size
+        if database == ":memory:":
+            database = f"file:router_memdb_{next(self._memory_ids)}?mode=memory&cache=shared"
+        self._connections: "Queue[sqlite3.Connection]" = Queue()
+        for _ in range(pool_size):
+            self._connections.put(sqlite3.connect(database, uri=database.startswith("file:"), check_same_thread=False))
+
+    def get_connection(self) -> _SQLiteConnection:
+        return _SQLiteConnection(self._connections.get(), self)
+
+_pool_lock = threading.Lock()
+_connection_pool: Optional[Any] = None
+_pool_slots: Optional[threading.BoundedSemaphore] = None
+
+def get_connection_pool() -> Any:
+    """
+    Return the process-wide connection pool, creating a MySQL pool from DB_CONFIG on first use.
+
+    Returns:
+        Any: MySQLConnectionPool, or the pool installed with set_connection_pool().
+    """
+    global _connection_pool, _pool_slots
+    if _connection_pool is None:
+        with _pool_lock:
+            if _connection_pool is None:
+                logger.info(f"Creating MySQL connection pool of size {DB_POOL_CONFIG['pool_size']}")
+                _pool_slots = threading.BoundedSemaphore(DB_POOL_CONFIG["pool_size"])
+                _connection_pool = pooling.MySQLConnectionPool(**DB_POOL_CONFIG, **DB_CONFIG)
+    return _connection_pool
+
+def set_connection_pool(pool: Any) -> None:
+    """
+    Install a connection pool, e.g. an SQLiteConnectionPool standing in for MySQL.
+
+    Args:
+        pool (Any): Object with get_connection() and pool_size, like MySQLConnectionPool.
+    """
+    global _connection_pool, _pool_slots
+    with _pool_lock:
+        _pool_slots = threading.BoundedSemaphore(pool.pool_size)
+        _connection_pool = pool
+
+@contextmanager
+def _connection() -> Iterator[Any]:
+    """Borrow a pooled connection, waiting for one instead of failing when all are in use."""
+    pool = get_connection_pool()
+    slots = _pool_slots
+    slots.acquire()
+    try:
+        connection = pool.get_connection()
+        try:
+            yield connection
+        finally:
+            connection.close()
+    finally:
+        slots.release()
+
+def _sql_prompt(query: str, db_schema: str) -> str:
+    """Build the prompt asking the LLM to translate a question into SQL."""
+    return f"""
+    You are an AI trained to convert natural language into SQL queries.
+    The database schema is as follows:
+    {db_schema}
+    Convert the following user query into SQL:
+    "{query}"
+    """
+
 def generate_sql_query(query: str, db_schema: str) -> str:
     """
     Generate an SQL query from a natural language input using Ollama.
@@ -26,48 +194,157 @@ def generate_sql_query(query: str, db_schema: str) -> str:
         str: Generated SQL query.
     """
     logger.info(f"Generating SQL for query: {query}")
-    llm = Ollama(model="llama3.2")
-    prompt = f"""
-    You are an AI trained to convert natural language into SQL queries.
-    The database schema is as follows:
-    {db_schema}
-    Convert the following user query into SQL:
-    "{query}"
-    """
-    response: str = llm.invoke(prompt)
+    with METRICS.stage("sql_generation"):
+        response: str = get_llm_client(SQL_MODEL).generate(_sql_prompt(query, db_schema))
     logger.info(f"Generated SQL: {response}")
     return response
 
-def execute_sql_query(sql_query: str) -> Union[str, List[Dict]]:
+def lookup_sql_query(query: str, db_schema: str) -> Optional[Tuple[str, Optional[Sequence[Any]]]]:
+    """
+    Turn a question into SQL from a template or the generated SQL cache, without calling the LLM.
+
+    Args:
+        query (str): User query.
+        db_schema (str): Database schema description.
+
+    Returns:
+        Optional[Tuple[str, Optional[Sequence[Any]]]]: SQL and the values bound to its %s
+        placeholders, or None if the LLM has to generate it.
+    """
+    template = match_sql_template(query, db_schema)
+    if template is not None:
+        return template.sql, template.params
+    return get_sql_cache().lookup(query, db_schema)
+
+def store_generated_sql(query: str, db_schema: str, sql: str) -> Tuple[str, Optional[Sequence[Any]]]:
+    """
+    Cache SQL generated by the LLM for later questions that differ only in their literals.
+
+    Args:
+        query (str): User query the SQL was generated for.
+        db_schema (str): Database schema description.
+        sql (str): SQL generated by the LLM.
+
+    Returns:
+        Tuple[str, Optional[Sequence[Any]]]: Parameterized SQL and this question's values, or the
+        generated SQL as is if it cannot be reused.
+    """
+    return get_sql_cache().store(query, db_schema, sql) or (sql, None)
+
+def resolve_sql_query(query: str, db_schema: str) -> Tuple[str, Optional[Sequence[Any]]]:
+    """
+    Turn a question into SQL from a template, the generated SQL cache, or the LLM.
+
+    SQL generated by the LLM is cached per literal-stripped question, so "Delete
+    order with ID 7" reuses the statement generated for "Delete order with ID 3".
+
+    Args:
+        query (str): User query.
+        db_schema (str): Database schema description.
+
+    Returns:
+        Tuple[str, Optional[Sequence[Any]]]: SQL and the values bound to its %s placeholders.
+    """
+    statement = lookup_sql_query(query, db_schema)
+    if statement is not None:
+        return statement
+    return store_generated_sql(query, db_schema, generate_sql_query(query, db_schema))
+
+def stream_sql_generation(query: str, db_schema: str) -> Iterator[str]:
+    """
+    Stream SQL generation token by token.
+
+    Args:
+        query (str): User query.
+        db_schema (str): Database schema description.
+
+    Yields:
+        str: Next piece of the generated SQL.
+    """
+    logger.info(f"Streaming SQL generation for query: {query}")
+    yield from get_llm_client(SQL_MODEL).stream(_sql_prompt(query, db_schema))
+
+def execute_sql_query(sql_query: str, params: Optional[Sequence[Any]] = None, max_rows: Optional[int] = None) -> Union[str, List[Dict]]:
     """
     Execute an SQL query on the MySQL database.
 
     Args:
         sql_query (str): SQL query to execute.
+        params (Optional[Sequence[Any]]): Values bound to %s placeholders in the query.
+        max_rows (Optional[int]): Return at most this many rows, e.g. DB_ROW_CAP for the UI.
 
     Returns:
         Union[str, List[Dict]]: Query results or execution status.
     """
     logger.info(f"Executing SQL: {sql_query}")
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute(sql_query)
-
-        if sql_query.strip().lower().startswith("select"):
-            results: List[Dict] = cursor.fetchall()
-        else:
-            connection.commit()
-            results = f"Query executed successfully: {sql_query}"
-
-        cursor.close()
-        connection.close()
+        with METRICS.stage("sql_execution"), _connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(sql_query, params)
+                if cursor.with_rows:
+                    if max_rows is None:
+                        results: Union[str, List[Dict]] = cursor.fetchall()
+                    else:
+                        results = cursor.fetchmany(max_rows)
+                        connection.consume_results()
+                else:
+                    connection.commit()
+                    results = f"Query executed successfully: {sql_query}"
+            finally:
+                cursor.close()
+
         logger.info(f"SQL execution result: {results}")
         return results
     except mysql.connector.Error as err:
         logger.error(f"Database error: {err}")
         return f"Database error: {err}"
 
+def stream_sql_results(
+    sql_query: str,
+    params: Optional[Sequence[Any]] = None,
+    chunk_size: int = 500,
+    max_rows: Optional[int] = None,
+) -> Iterator[List[Dict]]:
+    """
+    Execute a row-returning SQL query and yield its rows in chunks.
+
+    Uses an unbuffered cursor, so MySQL streams rows from the server as they are
+    fetched instead of materializing the whole result set on the client.
+
+    Args:
+        sql_query (str): SQL query to execute.
+        params (Optional[Sequence[Any]]): Values bound to %s placeholders in the query.
+        chunk_size (int): Rows per yielded chunk.
+        max_rows (Optional[int]): Stop after this many rows.
+
+    Yields:
+        List[Dict]: Next chunk of rows.
+
+    Raises:
+        mysql.connector.Error: If the query fails.
+    """
+    logger.info(f"Streaming SQL: {sql_query}")
+    with _connection() as connection:
+        cursor = connection.cursor(dictionary=True, buffered=False)
+        try:
+            cursor.execute(sql_query, params)
+            if not cursor.with_rows:
+                connection.commit()
+                return
+            remaining = max_rows
+            while remaining is None or remaining > 0:
+                rows: List[Dict] = cursor.fetchmany(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not rows:
+                    break
+                if remaining is not None:
+                    remaining -= len(rows)
+                yield rows
+        finally:
+            # Drop rows left unread by max_rows or an abandoned generator before the connection is reused
+            connection.consume_results()
+            cursor.close()
+
 if __name__ == "__main__":
     schema = """
     Tables:
@@ -76,5 +353,5 @@ if __name__ == "__main__":
     orders (id INT, user_id INT, product_id INT, quantity INT)
     """
     sql = generate_sql_query("Show me all the users of the database", schema)
-    result = execute_sql_query(sql)
+    result = execute_sql_query(sql, max_rows=DB_ROW_CAP)
     logger.info(f"Test result: {result}")
\ No newline at end of file
@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+import httpx
+import ollama
+from metrics import METRICS
+from llm_scheduler import LLM_SCHEDULER_CONFIG, ModelScheduler, prompt_priority
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+OLLAMA_CONFIG = {
+    "host": "http://localhost:11434",
+    "timeout": 120.0,
+    # How long Ollama keeps a model loaded after a request
+    "keep_alive": "30m",
+}
+
+# Maximum concurrent requests per model; models not listed use DEFAULT_LLM_CONCURRENCY
+LLM_CONCURRENCY: Dict[str, int] = {
+    "llama3.1": 2,
+    "llama3.2": 2,
+}
+DEFAULT_LLM_CONCURRENCY = 2
+
+class LLMClient:
+    """
+    Client for one Ollama model, shared by every request in the process.
+
+    Requests go through a single keep-alive HTTP connection pool and queue in a
+    ModelScheduler that allows max_concurrency in flight at a time and serves
+    short prompts first. Identical non-streaming requests that arrive while one
+    is in flight share its response instead of generating it again.
+    """
+
+    def __init__(self, model: str, client: ollama.Client, max_concurrency: int, keep_alive: Optional[str] = None):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.keep_alive = keep_alive
+        self._client = client
+        self.scheduler = ModelScheduler(
+            model,
+            max_concurrency,
+            LLM_SCHEDULER_CONFIG["max_queue"],
+            LLM_SCHEDULER_CONFIG["queue_timeout"],
+        )
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.coalesced = 0
+
+    def generate(self, prompt: str, options: Optional[Dict[str, Any]] = None, priority: Optional[int] = None) -> str:
+        """
+        Generate a completion for a prompt.
+
+        Args:
+            prompt (str): Full prompt text.
+            options (Optional[Dict[str, Any]]): Ollama model options, e.g. temperature.
+            priority (Optional[int]): Queue priority. Defaults to llm_scheduler.prompt_priority(prompt).
+
+        Returns:
+            str: Generated text.
+
+        Raises:
+            llm_scheduler.LLMQueueFull: If too many requests are already waiting for the model.
+            TimeoutError: If the request waited too long for a slot.
+        """
+        key = (prompt, repr(sorted((options or {}).items())))
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            logger.info(f"Joining identical in-flight {self.model} request")
+            return future.result()
+
+        try:
+            with self.scheduler.slot(prompt_priority(prompt) if priority is None else priority), \
+                    METRICS.stage("llm_generation", model=self.model):
+                response = self._client.generate(model=self.model, prompt=prompt, options=options, keep_alive=self.keep_alive)
+            self._observe_speed(response)
+            future.set_result(response["response"])
+            return response["response"]
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _observe_speed(self, response: Any) -> None:
+        """Record tokens/sec from the eval stats Ollama attaches to the final response."""
+        eval_count = response.get("eval_count")
+        eval_duration = response.get("eval_duration")
+        if eval_count and eval_duration:
+            METRICS.observe_generation(self.model, eval_count, eval_duration / 1e9)
+
+    def stream(self, prompt: str, options: Optional[Dict[str, Any]] = None, priority: Optional[int] = None) -> Iterator[str]:
+        """
+        Generate a completion for a prompt, yielding text as Ollama produces it.
+
+        The scheduler slot is held until the stream is exhausted or closed.
+
+        Args:
+            prompt (str): Full prompt text.
+            options (Optional[Dict[str, Any]]): Ollama model options, e.g. temperature.
+            priority (Optional[int]): Queue priority. Defaults to llm_scheduler.prompt_priority(prompt).
+
+        Yields:
+            str: Next piece of generated text.
+        """
+        with self.scheduler.slot(prompt_priority(prompt) if priority is None else priority), \
+                METRICS.stage("llm_generation", model=self.model):
+            start = time.perf_counter()
+            first_token = True
+            for chunk in self._client.generate(model=self.model, prompt=prompt, options=options, keep_alive=self.keep_alive, stream=True):
+                if chunk.get("done"):
+                    self._observe_speed(chunk)
+                if chunk["response"]:
+                    if first_token:
+                        METRICS.observe_stage("llm_first_token", time.perf_counter() - start, model=self.model)
+                        first_token = False
+                    yield chunk["response"]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Request counters.
+
+        Returns:
+            Dict[str, int]: Scheduler queue counters plus requests served by an identical in-flight one.
+        """
+        return {**self.scheduler.stats(), "coalesced": self.coalesced}
+
+class TimedStream:
+    """
+    Iterator wrapper recording time to first token and total latency of a stream.
+
+    Timing starts when the wrapper is created, so wrap the stream as soon as the
+    request arrives to include everything before the first token.
+    """
+
+    def __init__(self, tokens: Iterable[str]):
+        self._tokens = tokens
+        self.started = time.perf_counter()
+        self.time_to_first_token: Optional[float] = None
+        self.total_time: Optional[float] = None
+        self.chunks = 0
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            for token in self._tokens:
+                if self.time_to_first_token is None:
+                    self.time_to_first_token = time.perf_counter() - self.started
+                self.chunks += 1
+                yield token
+        finally:
+            self.total_time = time.perf_counter() - self.started
+
+_registry_lock = threading.Lock()
+_ollama_client: Optional[ollama.Client] = None
+_llm_clients: Dict[str, LLMClient] = {}
+
+def _shared_ollama_client() -> ollama.Client:
+    """Create the process-wide Ollama HTTP client. Caller must hold the registry lock."""
+    global _ollama_client
+    if _ollama_client is None:
+        max_connections = max([DEFAULT_LLM_CONCURRENCY, *LLM_CONCURRENCY.values()]) * max(len(LLM_CONCURRENCY), 1)
+        _ollama_client = ollama.Client(
+            host=OLLAMA_CONFIG["host"],
+            timeout=OLLAMA_CONFIG["timeout"],
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+    return _ollama_client
+
+def get_llm_client(model: str) -> LLMClient:
+    """
+    Return the process-wide client for a model, creating it on first use.
+
+    Args:
+        model (str): Ollama model name, e.g. "llama3.1".
+
+    Returns:
+        LLMClient: Shared client.
+    """
+    client = _llm_clients.get(model)
+    if client is not None:
+        return client
+    with _registry_lock:
+        if model not in _llm_clients:
+            logger.info(f"Creating LLM client for {model}")
+            _llm_clients[model] = LLMClient(
+                model,
+                _shared_ollama_client(),
+                LLM_CONCURRENCY.get(model, DEFAULT_LLM_CONCURRENCY),
+                OLLAMA_CONFIG["keep_alive"],
+            )
+        return _llm_clients[model]
+
+def reset_llm_clients() -> None:
+    """Drop all clients so the next request picks up changed OLLAMA_CONFIG, LLM_CONCURRENCY or LLM_SCHEDULER_CONFIG."""
+    global _ollama_client
+    with _registry_lock:
+        _llm_clients.clear()
+        _ollama_client = None
+
+if __name__ == "__main__":
+    logger.info(f"Test response: {get_llm_client('llama3.1').generate('Tell me a joke')}")
@@ -1,62 +1,187 @@
 import logging
-from typing import Dict, List, Optional
-from langchain.llms import Ollama
+import re
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlparse
 from langchain.prompts import PromptTemplate
-from langchain.memory import ConversationBufferMemory
-from langchain.chains import LLMChain
+from llm_clients import get_llm_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
-def get_static_response(query: str) -> str:
+NO_LIVE_DATA_RESPONSE = "Sorry, I couldn't find any relevant live data."
+
+STATIC_MODEL = "llama3.1"
+DYNAMIC_MODEL = "llama3.2"
+
+STATIC_PROMPT = PromptTemplate(
+    template="You are a polite chatbot. {history}Provide a short and sweet answer to the following query:\n{user_query}",
+    input_variables=["history", "user_query"]
+)
+
+DYNAMIC_PROMPT = PromptTemplate(
+    template="""
+    You are a helpful chatbot. Your role is to give accurate, real-time answers based on the most recent data.
+    Rules:
+    1. Prioritize live data provided.
+    2. Use the latest info from the data fed to you.
+    3. Keep answers crisp, short, and accurate.
+    {history}User's question: {user_query}
+    Most recent data:
+    {context}
+    """,
+    input_variables=["history", "user_query", "context"]
+)
+
+DYNAMIC_CONTEXT_CONFIG = {
+    # Approximate prompt tokens spent on scraped results
+    "max_context_tokens": 400,
+    # Snippets longer than this are cut at the last sentence end within the limit
+    "max_snippet_tokens": 60,
+}
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    "a an and are at be by for from how i in is it me of on or the to today what when where which who why with".split()
+)
+
+def history_block(history: str) -> str:
+    """
+    Prompt section with the conversation so far, or nothing for a first question.
+
+    Args:
+        history (str): Output of ConversationStore.history.
+
+    Returns:
+        str: Text inserted before the user's question.
+    """
+    return f"Conversation so far:\n{history}\n" if history else ""
+
+def should_cache_dynamic_response(response: str) -> bool:
+    """
+    Whether a dynamic answer may be cached; the no-data apology is retried instead.
+
+    Args:
+        response (str): Dynamic response.
+
+    Returns:
+        bool: True if the answer is worth caching.
     """
-    Generate a static response using LangChain and Ollama.
+    return response != NO_LIVE_DATA_RESPONSE
+
+def get_static_response(query: str, history: str = "") -> str:
+    """
+    Generate a static response using the shared Ollama client.
 
     Args:
         query (str): User query.
+        history (str): Earlier turns of the conversation, for follow-up questions.
 
     Returns:
         str: Static response.
     """
     logger.info(f"Generating static response for: {query}")
-    llm = Ollama(model="llama3.1")
-    memory = ConversationBufferMemory()
-    prompt_template = PromptTemplate(
-        template="You are a polite chatbot. Provide a short and sweet answer to the following query:\n{user_query}",
-        input_variables=["user_query"]
-    )
-    chain = LLMChain(llm=llm, prompt=prompt_template, memory=memory)
-    response: str = chain.run({"user_query": query})
+    response: str = get_llm_client(STATIC_MODEL).generate(STATIC_PROMPT.format(history=history_block(history), user_query=query))
     logger.info(f"Static response: {response}")
     return response
 
-def initialize_dynamic_chain() -> LLMChain:
+def stream_static_response(query: str, history: str = "") -> Iterator[str]:
+    """
+    Stream a static response token by token.
+
+    Args:
+        query (str): User query.
+        history (str): Earlier turns of the conversation, for follow-up questions.
+
+    Yields:
+        str: Next piece of the response.
+    """
+    logger.info(f"Streaming static response for: {query}")
+    yield from get_llm_client(STATIC_MODEL).stream(STATIC_PROMPT.format(history=history_block(history), user_query=query))
+
+def estimate_tokens(text: str) -> int:
     """
-    Initialize LangChain for dynamic query processing.
+    Approximate LLM token count: one token per word or punctuation mark.
+
+    Args:
+        text (str): Prompt text.
+
+    Returns:
+        int: Estimated tokens.
+    """
+    return len(_TOKEN.findall(text))
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut text to max_tokens, preferring the end of a sentence."""
+    tokens = list(_TOKEN.finditer(text))
+    if len(tokens) <= max_tokens:
+        return text
+    cut = text[:tokens[max_tokens - 1].end()]
+    sentence_end = max(cut.rfind(". "), cut.rfind("! "), cut.rfind("? "))
+    if sentence_end > len(cut) // 2:
+        return cut[:sentence_end + 1]
+    return f"{cut}..."
+
+def _terms(text: str) -> set:
+    return {word for word in _WORD.findall(text.lower()) if word not in _STOP_WORDS}
+
+def build_dynamic_context(query: str, results: List[Dict], max_tokens: Optional[int] = None) -> str:
+    """
+    Compress scraped results into the context of the dynamic prompt.
+
+    Results are deduplicated by URL and snippet, ranked by how many query terms
+    their title and snippet contain (search order breaks ties), shortened to
+    DYNAMIC_CONTEXT_CONFIG["max_snippet_tokens"], and added until the token
+    budget is spent.
+
+    Args:
+        query (str): User query.
+        results (List[Dict]): Scraped search results.
+        max_tokens (Optional[int]): Token budget. Defaults to DYNAMIC_CONTEXT_CONFIG["max_context_tokens"].
 
     Returns:
-        LLMChain: Configured chain for dynamic responses.
-    """
-    logger.info("Initializing dynamic LangChain")
-    llm = Ollama(model="llama3.2")
-    memory = ConversationBufferMemory()
-    prompt_template = PromptTemplate(
-        template="""
-        You are a helpful chatbot. Your role is to give accurate, real-time answers based on the most recent data.
-        Rules:
-        1. Prioritize live data provided.
-        2. Use the latest info from the data fed to you.
-        3. Keep answers crisp, short, and accurate.
-        User's question: {combined_input}
-        Most recent data: {combined_input}
-        """,
-        input_variables=["combined_input"]
+        str: One line per kept result.
+    """
+    budget = max_tokens or DYNAMIC_CONTEXT_CONFIG["max_context_tokens"]
+    query_terms = _terms(query)
+    seen = set()
+    ranked = []
+    for position, result in enumerate(results):
+        snippet = " ".join(result.get("snippet", "").split())
+        keys = {result.get("url"), snippet.lower()} - {None, ""}
+        if keys & seen:
+            continue
+        seen |= keys
+        relevance = 2 * len(query_terms & _terms(result["title"])) + len(query_terms & _terms(snippet))
+        ranked.append((-relevance, position, result["title"], snippet, result.get("url")))
+    ranked.sort()
+
+    lines: List[str] = []
+    used = 0
+    for _, _, title, snippet, url in ranked:
+        source = urlparse(url).netloc if url else ""
+        line = f"- {title}: {_truncate(snippet, DYNAMIC_CONTEXT_CONFIG['max_snippet_tokens'])}"
+        if source:
+            line += f" ({source})"
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            if lines:
+                break
+            line = _truncate(line, budget)
+            cost = budget
+        lines.append(line)
+        used += cost
+    logger.info(f"Dynamic context: {len(lines)} of {len(results)} results, ~{used} tokens")
+    return "\n".join(lines)
+
+def _dynamic_prompt(query: str, results: List[Dict], history: str = "") -> str:
+    """Format scraped results into the dynamic prompt."""
+    return DYNAMIC_PROMPT.format(
+        history=history_block(history), user_query=query, context=build_dynamic_context(query, results)
     )
-    chain = LLMChain(llm=llm, prompt=prompt_template, memory=memory)
-    return chain
 
-def process_dynamic_response(query: str, results: List[Dict], live_info: Optional[str], snippet: Optional[str]) -> str:
+def process_dynamic_response(query: str, results: List[Dict], live_info: Optional[str], snippet: Optional[str], history: str = "") -> str:
     """
     Process dynamic query with scraped data.
 
@@ -65,6 +190,7 @@ def process_dynamic_response(query: str, results: List[Dict], live_info: Optiona
         results (List[Dict]): Scraped search results.
         live_info (Optional[str]): Live data (e.g., weather).
         snippet (Optional[str]): Featured snippet.
+        history (str): Earlier turns of the conversation, for follow-up questions.
 
     Returns:
         str: Dynamic response.
@@ -75,14 +201,32 @@ def process_dynamic_response(query: str, results: List[Dict], live_info: Optiona
     if live_info:
         return live_info
     if results:
-        formatted_results = "\n".join(
-            [f"Title: {result['title']}\nSnippet: {result['snippet']}\nURL: {result['url']}" for result in results]
-        )
-        combined_input = f"User Input: {query}\n\nMost Recent Data:\n{formatted_results}"
-        chain = initialize_dynamic_chain()
-        response: str = chain.run({"combined_input": combined_input})
+        response: str = get_llm_client(DYNAMIC_MODEL).generate(_dynamic_prompt(query, results, history))
         return response
-    return "Sorry, I couldn't find any relevant live data."
+    return NO_LIVE_DATA_RESPONSE
+
+def stream_dynamic_response(query: str, results: List[Dict], live_info: Optional[str], snippet: Optional[str], history: str = "") -> Iterator[str]:
+    """
+    Stream a dynamic response token by token.
+
+    Featured snippets, live info and the no-data message are yielded whole since
+    they need no generation.
+
+    Args:
+        query (str): User query.
+        results (List[Dict]): Scraped search results.
+        live_info (Optional[str]): Live data (e.g., weather).
+        snippet (Optional[str]): Featured snippet.
+        history (str): Earlier turns of the conversation, for follow-up questions.
+
+    Yields:
+        str: Next piece of the response.
+    """
+    logger.info(f"Streaming dynamic response for: {query}")
+    if snippet or live_info or not results:
+        yield process_dynamic_response(query, results, live_info, snippet, history)
+        return
+    yield from get_llm_client(DYNAMIC_MODEL).stream(_dynamic_prompt(query, results, history))
 
 if __name__ == "__main__":
     response = get_static_response("Tell me a joke")
@@ -0,0 +1,178 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from metrics import METRICS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+LLM_SCHEDULER_CONFIG = {
+    # Waiting requests per model before new ones are rejected with LLMQueueFull
+    "max_queue": 64,
+    # Seconds a request may wait for a slot before it fails with TimeoutError
+    "queue_timeout": 60.0,
+    # Prompts of at most this many words are interactive and jump ahead of longer ones
+    "short_prompt_words": 200,
+}
+
+# Queue priorities; lower values are served first
+INTERACTIVE = 0
+BULK = 1
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BULK: "bulk"}
+
+class LLMQueueFull(RuntimeError):
+    """Raised when a model's queue is at LLM_SCHEDULER_CONFIG["max_queue"]."""
+
+def prompt_priority(prompt: str) -> int:
+    """
+    Queue priority of a prompt: short prompts are interactive, long ones bulk.
+
+    Args:
+        prompt (str): Full prompt text.
+
+    Returns:
+        int: INTERACTIVE or BULK.
+    """
+    return INTERACTIVE if len(prompt.split()) <= LLM_SCHEDULER_CONFIG["short_prompt_words"] else BULK
+
+class _Ticket:
+    """A request waiting for a slot."""
+
+    __slots__ = ("granted", "abandoned")
+
+    def __init__(self):
+        self.granted = threading.Event()
+        self.abandoned = False
+
+class ModelScheduler:
+    """
+    Priority queue in front of one Ollama model.
+
+    At most max_concurrency requests run at once. Further requests wait in
+    priority order (FIFO within a priority); when max_queue are already waiting,
+    new ones are rejected instead of piling up, and a request that waits longer
+    than queue_timeout gives up. Queue depth, running requests and wait times
+    are exported through metrics.METRICS.
+    """
+
+    def __init__(self, model: str, max_concurrency: int, max_queue: int = 64, queue_timeout: float = 60.0):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._waiting: List[tuple] = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def depth(self) -> int:
+        """Requests currently waiting."""
+        return self._depth
+
+    @property
+    def active(self) -> int:
+        """Requests currently holding a slot."""
+        return self._active
+
+    def _publish(self) -> None:
+        """Export queue gauges. Caller must hold the lock."""
+        METRICS.set_gauge("router_llm_queue_depth", self._depth, model=self.model)
+        METRICS.set_gauge("router_llm_active_requests", self._active, model=self.model)
+
+    def acquire(self, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            priority (int): INTERACTIVE or BULK.
+            timeout (Optional[float]): Seconds to wait. Defaults to queue_timeout.
+
+        Raises:
+            LLMQueueFull: If max_queue requests are already waiting.
+            TimeoutError: If no slot frees up in time.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            if self._active < self.max_concurrency and not self._depth:
+                self._active += 1
+                self._publish()
+                METRICS.observe("router_llm_queue_wait_seconds", 0.0, model=self.model, priority=PRIORITY_NAMES[priority])
+                return
+            if self._depth >= self.max_queue:
+                self.rejected += 1
+                raise LLMQueueFull(f"{self.model} queue is full ({self._depth} waiting)")
+            ticket = _Ticket()
+            heapq.heappush(self._waiting, (priority, next(self._sequence), ticket))
+            self._depth += 1
+            self._publish()
+
+        granted = ticket.granted.wait(self.queue_timeout if timeout is None else timeout)
+        if not granted:
+            with self._lock:
+                # A slot may have been handed over between the timeout and taking the lock
+                granted = ticket.granted.is_set()
+                if not granted:
+                    ticket.abandoned = True
+                    self._depth -= 1
+                    self.timed_out += 1
+                    self._publish()
+        wait = time.perf_counter() - start
+        METRICS.observe("router_llm_queue_wait_seconds", wait, model=self.model, priority=PRIORITY_NAMES[priority])
+        if not granted:
+            raise TimeoutError(f"Waited {wait:.1f}s for a {self.model} slot")
+
+    def release(self) -> None:
+        """Free a slot, handing it to the highest-priority waiting request."""
+        with self._lock:
+            self.completed += 1
+            while self._waiting:
+                _, _, ticket = heapq.heappop(self._waiting)
+                if not ticket.abandoned:
+                    self._depth -= 1
+                    ticket.granted.set()
+                    break
+            else:
+                self._active -= 1
+            self._publish()
+
+    @contextmanager
+    def slot(self, priority: int = INTERACTIVE, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of a with-block.
+
+        Args:
+            priority (int): INTERACTIVE or BULK.
+            timeout (Optional[float]): Seconds to wait. Defaults to queue_timeout.
+        """
+        self.acquire(priority, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Scheduler counters.
+
+        Returns:
+            Dict[str, int]: Waiting and running requests, completed, rejected and timed out requests.
+        """
+        with self._lock:
+            return {
+                "depth": self._depth,
+                "active": self._active,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
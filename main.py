@@ -1,59 +1,337 @@
 import logging
-from typing import Optional
+import time
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 import streamlit as st
-from query_classifier import train_classifier, classify_query
-from web_scraper import scrape
-from llm_processor import get_static_response, process_dynamic_response
-from db_handler import generate_sql_query, execute_sql_query
+from metrics import METRICS, route_context, start_metrics_server
+from startup import load_route, warm_up
+
+# Backends (scikit-learn, selenium, langchain, mysql.connector) are imported on
+# first use of their route through startup.load_route, so the UI renders first.
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
-DB_SCHEMA = """
-Tables:
-users (id INT, name VARCHAR, email VARCHAR)
-products (id INT, name VARCHAR, price DECIMAL)
-orders (id INT, user_id INT, product_id INT, quantity INT)
-"""
+# Port of the /metrics endpoint, or None to disable it
+METRICS_PORT: Optional[int] = 9108
+
+BUSY_RESPONSE = "The server is busy right now. Please try again in a moment."
+
+def busy_response(error: Exception) -> str:
+    """
+    Count a query turned away by LLM backpressure and return the message shown instead.
+
+    Args:
+        error (Exception): LLMQueueFull or TimeoutError raised while answering.
+
+    Returns:
+        str: BUSY_RESPONSE.
+    """
+    from llm_scheduler import LLMQueueFull
+
+    reason = "queue_full" if isinstance(error, LLMQueueFull) else "timeout"
+    METRICS.increment("router_busy_rejections_total", reason=reason)
+    logger.warning(f"Query rejected ({reason}): {error}")
+    return BUSY_RESPONSE
+
+def answer_dynamic_query(query: str, history: str = "") -> str:
+    """
+    Scrape live data for a query and turn it into an answer.
+
+    Args:
+        query (str): User query.
+        history (str): Earlier turns of the conversation, for follow-up questions.
+
+    Returns:
+        str: Response to the query.
+    """
+    load_route("dynamic")
+    from web_scraper import cached_scrape
+    from llm_processor import process_dynamic_response
+
+    results, live_info, snippet = cached_scrape(query)
+    return process_dynamic_response(query, results, live_info, snippet, history)
 
-def handle_query(query: str, model) -> str:
+def route_query(query: str, query_type: str, history: str = "") -> str:
+    """
+    Answer a query through the backend of an already classified type.
+
+    Follow-up answers that depend on conversation history bypass the response
+    caches, which are keyed by the query alone.
+
+    Args:
+        query (str): User query.
+        query_type (str): Query type ('static', 'dynamic', or 'sql').
+        history (str): Earlier turns of the conversation, for follow-up questions.
+
+    Returns:
+        str: Response to the query.
+    """
+    logger.info(f"Handling query: {query} as {query_type}")
+
+    with route_context(query_type), METRICS.stage("total"):
+        load_route(query_type)
+        if query_type == "sql":
+            from db_handler import DB_ROW_CAP, DB_SCHEMA, resolve_sql_query, execute_sql_query
+
+            sql, params = resolve_sql_query(query, DB_SCHEMA)
+            logger.info(f"Generated SQL: {sql}")
+            return str(execute_sql_query(sql, params, max_rows=DB_ROW_CAP))
+        elif query_type == "dynamic":
+            from llm_processor import should_cache_dynamic_response
+            from result_cache import get_result_cache
+
+            if history:
+                return answer_dynamic_query(query, history)
+            return get_result_cache("dynamic_answer").get_or_compute(
+                query,
+                lambda: answer_dynamic_query(query),
+                cache_if=should_cache_dynamic_response,
+            )
+        else:
+            from llm_processor import get_static_response
+            from response_cache import get_response_cache
+
+            if history:
+                return get_static_response(query, history)
+            return get_response_cache().get_or_compute(query, lambda: get_static_response(query))
+
+def current_session_id() -> Optional[str]:
+    """
+    ID of the Streamlit session running this script, if any.
+
+    Returns:
+        Optional[str]: Session ID, or None outside a Streamlit run.
+    """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+def _session_history(session_id: Optional[str], query: str) -> str:
+    """Conversation to answer a follow-up with; standalone queries get none, so they stay cacheable."""
+    if session_id is None:
+        return ""
+    from conversation_store import get_conversation_store, is_follow_up
+
+    return get_conversation_store().history(session_id) if is_follow_up(query) else ""
+
+def _remember(session_id: Optional[str], query: str, response: str) -> None:
+    if session_id is not None:
+        from conversation_store import get_conversation_store
+
+        get_conversation_store().append(session_id, query, response)
+
+def handle_query(query: str, model, session_id: Optional[str] = None) -> str:
     """
     Handle user query based on its type (static, dynamic, sql).
 
     Args:
         query (str): User query.
         model: Trained classifier model.
+        session_id (Optional[str]): Conversation to answer in and record the turn to, if any.
 
     Returns:
         str: Response to the query.
     """
-    query_type = classify_query(query, model)
-    logger.info(f"Handling query: {query} as {query_type}")
+    with METRICS.stage("classify"):
+        probabilities = _classify(query, model)
+    response = answer_classified_query(query, probabilities, _session_history(session_id, query))
+    _remember(session_id, query, response)
+    return response
+
+def _classify(query: str, model) -> Dict[str, float]:
+    load_route("classifier")
+    from query_classifier import classify_query_proba
 
+    return classify_query_proba(query, model)
+
+def load_classifier():
+    """
+    Import scikit-learn and load the classifier artifact on first use.
+
+    Returns:
+        Pipeline: Trained classifier model.
+    """
+    load_route("classifier")
+    from query_classifier import get_classifier
+
+    return get_classifier()
+
+def answer_classified_query(query: str, probabilities: Dict[str, float], history: str = "") -> str:
+    """
+    Answer a scored query, racing the two likeliest routes when the classification is close.
+
+    Args:
+        query (str): User query.
+        probabilities (Dict[str, float]): Probability of each query type.
+        history (str): Earlier turns of the conversation, for follow-up questions.
+
+    Returns:
+        str: Response to the query.
+    """
+    from async_pipeline import route_speculatively_async, run_coroutine, speculation_candidates
+
+    candidates = speculation_candidates(probabilities)
+    if len(candidates) > 1:
+        return run_coroutine(route_speculatively_async(query, candidates, history))
+    return route_query(query, candidates[0], history)
+
+def stream_query(query: str, query_type: str, history: str = "") -> Iterator[str]:
+    """
+    Answer a classified query, yielding the response as it is generated.
+
+    Args:
+        query (str): User query.
+        query_type (str): Query type ('static', 'dynamic', or 'sql').
+        history (str): Earlier turns of the conversation, for follow-up questions.
+
+    Yields:
+        str: Next piece of the response.
+    """
+    logger.info(f"Streaming query: {query} as {query_type}")
+    with route_context(query_type), METRICS.stage("total"):
+        load_route(query_type)
+        yield from _stream_route(query, query_type, history)
+
+def _stream_route(query: str, query_type: str, history: str = "") -> Iterator[str]:
+    """Stream the answer of a classified query from its backend; answers that depend on history bypass the caches."""
     if query_type == "sql":
-        sql = generate_sql_query(query, DB_SCHEMA)
+        from db_handler import (DB_ROW_CAP, DB_SCHEMA, execute_sql_query, lookup_sql_query, store_generated_sql,
+                                stream_sql_generation)
+
+        statement = lookup_sql_query(query, DB_SCHEMA)
+        if statement is not None:
+            yield statement[0]
+            yield f"\n\n{execute_sql_query(*statement, max_rows=DB_ROW_CAP)}"
+            return
+        sql_parts = []
+        for token in stream_sql_generation(query, DB_SCHEMA):
+            sql_parts.append(token)
+            yield token
+        sql = "".join(sql_parts)
         logger.info(f"Generated SQL: {sql}")
-        return str(execute_sql_query(sql))
+        sql, params = store_generated_sql(query, DB_SCHEMA, sql)
+        yield f"\n\n{execute_sql_query(sql, params, max_rows=DB_ROW_CAP)}"
     elif query_type == "dynamic":
-        results, live_info, snippet = scrape(query)
-        return process_dynamic_response(query, results, live_info, snippet)
+        from web_scraper import cached_scrape
+        from llm_processor import should_cache_dynamic_response, stream_dynamic_response
+        from result_cache import get_result_cache
+
+        cache = get_result_cache("dynamic_answer")
+        cached = None if history else cache.get(query)
+        if cached is not None:
+            yield cached
+            return
+        results, live_info, snippet = cached_scrape(query)
+        response_parts = []
+        for token in stream_dynamic_response(query, results, live_info, snippet, history):
+            response_parts.append(token)
+            yield token
+        response = "".join(response_parts)
+        if should_cache_dynamic_response(response) and not history:
+            cache.put(query, response)
     else:
-        return get_static_response(query)
+        from llm_processor import stream_static_response
+        from response_cache import get_response_cache
+
+        if history:
+            yield from stream_static_response(query, history)
+            return
+        static_cache = get_response_cache()
+        cached = static_cache.lookup(query)
+        if cached is not None:
+            yield cached
+            return
+        start = time.perf_counter()
+        response_parts = []
+        for token in stream_static_response(query):
+            response_parts.append(token)
+            yield token
+        static_cache.store(query, "".join(response_parts), time.perf_counter() - start)
+
+def handle_query_stream(query: str, model, session_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Handle user query based on its type, yielding the response as it is generated.
+
+    When the LLM queue is full or a request waits too long, BUSY_RESPONSE is
+    yielded instead and the turn is not recorded.
+
+    Args:
+        query (str): User query.
+        model: Trained classifier model.
+        session_id (Optional[str]): Conversation to answer in and record the turn to, if any.
+
+    Yields:
+        str: Next piece of the response.
+    """
+    from async_pipeline import route_speculatively_async, run_coroutine, speculation_candidates
+    from llm_scheduler import LLMQueueFull
+
+    with METRICS.stage("classify"):
+        probabilities = _classify(query, model)
+    history = _session_history(session_id, query)
+    candidates = speculation_candidates(probabilities)
+    response_parts = []
+    try:
+        if len(candidates) > 1:
+            # Racing routes cannot stream; the winner's answer is shown whole
+            response_parts.append(run_coroutine(route_speculatively_async(query, candidates, history)))
+            yield response_parts[0]
+        else:
+            for token in stream_query(query, candidates[0], history):
+                response_parts.append(token)
+                yield token
+    except (LLMQueueFull, TimeoutError) as e:
+        yield f"\n\n{busy_response(e)}" if response_parts else busy_response(e)
+        return
+    _remember(session_id, query, "".join(response_parts))
+
+def handle_queries(queries: Iterable[str], model, batch_size: int = 256) -> Iterator[Tuple[str, str]]:
+    """
+    Handle a stream of queries, classifying them in vectorized batches.
+
+    Args:
+        queries (Iterable[str]): User queries, e.g. a replayed query log.
+        model: Trained classifier model.
+        batch_size (int): Number of queries classified together.
+
+    Yields:
+        Tuple[str, str]: Query and its response.
+    """
+    load_route("classifier")
+    from query_classifier import classify_queries
+
+    for query, _, probabilities in classify_queries(queries, model, batch_size=batch_size):
+        yield query, answer_classified_query(query, probabilities)
 
 def main() -> None:
     """Run the Streamlit application."""
+    if METRICS_PORT is not None:
+        start_metrics_server(METRICS_PORT)
     st.title("Davinators Query Bot :)")
     st.write("Dare to ask me anything")
 
-    model = train_classifier()
     user_query = st.text_input("Enter your question:", placeholder="e.g., How can I be a billionaire?")
+    # Load backends in the background while the user types
+    warm_up()
     if st.button("Send"):
         if user_query:
-            with st.spinner("Processing your query..."):
-                response = handle_query(user_query, model)
+            from llm_clients import TimedStream
+            from llm_scheduler import LLMQueueFull
+
+            stream = TimedStream(handle_query_stream(user_query, load_classifier(), current_session_id()))
             st.success("Here is your response:")
-            st.write(response)
+            try:
+                st.write_stream(stream)
+            except (LLMQueueFull, TimeoutError) as e:
+                st.warning(busy_response(e))
+                return
+            first_token = stream.time_to_first_token if stream.time_to_first_token is not None else stream.total_time
+            logger.info(f"Time to first token: {first_token:.3f}s, total: {stream.total_time:.3f}s")
+            st.caption(f"First token after {first_token:.2f}s, completed in {stream.total_time:.2f}s")
         else:
             st.error("Please enter a query!")
 
@@ -0,0 +1,288 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the stage latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Upper bounds of the generation speed histogram buckets
+TOKENS_PER_SECOND_BUCKETS: Tuple[float, ...] = (1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0, 320.0)
+
+METRIC_HELP: Dict[str, str] = {
+    "router_stage_seconds": "Duration of each request stage in seconds.",
+    "router_llm_tokens_per_second": "Ollama generation speed in tokens per second.",
+    "router_llm_queue_wait_seconds": "Time LLM requests waited in the scheduler queue in seconds.",
+    "router_llm_queue_depth": "LLM requests waiting in the scheduler queue.",
+    "router_llm_active_requests": "LLM requests currently sent to Ollama.",
+    "router_busy_rejections_total": "Queries answered with a busy message because the LLM queue was full or timed out.",
+}
+
+# Route ('static', 'dynamic', 'sql') of the request being handled in the current context
+current_route: contextvars.ContextVar[str] = contextvars.ContextVar("current_route", default="unclassified")
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(upper bound, observations at or below it) pairs, ending with +Inf."""
+        total = 0
+        pairs: List[Tuple[str, int]] = []
+        for bound, count in zip([*map(repr, self.buckets), "+Inf"], self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+class MetricsRegistry:
+    """Thread-safe store of labelled histograms, gauges and counters with Prometheus text and JSON export."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelSet, Histogram]] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        self._gauges: Dict[str, Dict[LabelSet, float]] = {}
+        self._counters: Dict[str, Dict[LabelSet, float]] = {}
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: str) -> None:
+        """
+        Record one observation.
+
+        Args:
+            name (str): Metric name.
+            value (float): Observed value.
+            buckets (Sequence[float]): Bucket bounds, used when the metric is first seen.
+            **labels (str): Label values, e.g. stage="classify".
+        """
+        key: LabelSet = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self._buckets.setdefault(name, buckets))
+            histogram.observe(value)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        """
+        Set the current value of a gauge, e.g. a queue depth.
+
+        Args:
+            name (str): Metric name.
+            value (float): Current value.
+            **labels (str): Label values, e.g. model="llama3.1".
+        """
+        with self._lock:
+            self._gauges.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+
+    def increment(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """
+        Add to a counter, e.g. of rejected requests.
+
+        Args:
+            name (str): Metric name, ending in _total.
+            amount (float): Value added.
+            **labels (str): Label values, e.g. reason="queue_full".
+        """
+        key: LabelSet = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe_stage(self, stage: str, seconds: float, **labels: str) -> None:
+        """
+        Record the duration of a request stage under the current route.
+
+        Args:
+            stage (str): Stage name, e.g. "scrape_page_load".
+            seconds (float): Duration.
+            **labels (str): Extra labels, e.g. backend="http".
+        """
+        labels.setdefault("route", current_route.get())
+        self.observe("router_stage_seconds", seconds, stage=stage, **labels)
+
+    @contextmanager
+    def stage(self, stage: str, **labels: str) -> Iterator[None]:
+        """
+        Time a with-block as a request stage.
+
+        Args:
+            stage (str): Stage name.
+            **labels (str): Extra labels.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start, **labels)
+
+    def observe_generation(self, model: str, tokens: int, seconds: float) -> None:
+        """
+        Record Ollama generation speed from a response's eval_count and eval_duration.
+
+        Args:
+            model (str): Ollama model name.
+            tokens (int): Generated tokens.
+            seconds (float): Generation time.
+        """
+        if tokens and seconds > 0:
+            self.observe(
+                "router_llm_tokens_per_second",
+                tokens / seconds,
+                buckets=TOKENS_PER_SECOND_BUCKETS,
+                model=model,
+                route=current_route.get(),
+            )
+
+    def render_prometheus(self) -> str:
+        """
+        Export all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text.
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(series.items()):
+                    label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                    prefix = f"{label_text}," if label_text else ""
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+                    lines.append(f"{name}_sum{{{label_text}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+            for kind, metrics in (("gauge", self._gauges), ("counter", self._counters)):
+                for name, series in sorted(metrics.items()):
+                    lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for labels, value in sorted(series.items()):
+                        label_text = ",".join(f'{key}="{label_value}"' for key, label_value in labels)
+                        lines.append(f"{name}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict[str, List[Dict]]:
+        """
+        Export all histograms as JSON-serializable data.
+
+        Returns:
+            Dict[str, List[Dict]]: Per metric, one entry per label set with count, sum, mean and
+            buckets for histograms, or the value for gauges and counters.
+        """
+        data: Dict[str, List[Dict]] = {}
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                data[name] = [
+                    {
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                        "buckets": dict(histogram.cumulative()),
+                    }
+                    for labels, histogram in sorted(series.items())
+                ]
+            for metrics in (self._gauges, self._counters):
+                for name, series in sorted(metrics.items()):
+                    data[name] = [{"labels": dict(labels), "value": value} for labels, value in sorted(series.items())]
+        return data
+
+    def reset(self) -> None:
+        """Drop all recorded observations."""
+        with self._lock:
+            self._histograms.clear()
+            self._buckets.clear()
+            self._gauges.clear()
+            self._counters.clear()
+
+# Process-wide registry every module records into
+METRICS = MetricsRegistry()
+
+@contextmanager
+def route_context(route: str) -> Iterator[None]:
+    """
+    Label stages recorded inside the with-block with a route.
+
+    Args:
+        route (str): Query type being handled.
+    """
+    token = current_route.set(route)
+    try:
+        yield
+    finally:
+        current_route.reset(token)
+
+_server_lock = threading.Lock()
+_server: Optional[ThreadingHTTPServer] = None
+# Set when binding failed, so later calls don't retry and log again
+_server_failed = False
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = METRICS) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics (Prometheus text) and /metrics.json in a background thread.
+
+    Safe to call on every Streamlit rerun: only the first call starts a server,
+    and if the port is unavailable later calls return None without retrying.
+
+    Args:
+        port (int): Port to listen on.
+        host (str): Interface to bind.
+        registry (MetricsRegistry): Registry to export.
+
+    Returns:
+        Optional[ThreadingHTTPServer]: Running server, or None if the port is unavailable.
+    """
+    global _server, _server_failed
+    with _server_lock:
+        if _server is not None or _server_failed:
+            return _server
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body, content_type = registry.render_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.to_json()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug(format % args)
+
+        try:
+            _server = ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            logger.warning(f"Could not start metrics server on port {port}: {e}")
+            _server_failed = True
+            return None
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info(f"Serving metrics at http://{host}:{port}/metrics")
+        return _server
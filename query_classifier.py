@@ -1,13 +1,25 @@
+import argparse
+import hashlib
+import json
 import logging
-from typing import List, Tuple
+import os
+import tempfile
+import threading
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import joblib
+import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.pipeline import Pipeline
+from sklearn.pipeline import Pipeline, make_pipeline
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
+# Directory holding the persisted classifier artifacts
+MODEL_DIR = os.environ.get("ROUTER_MODEL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "models"))
+
 # Full training data as provided
 TRAINING_DATA: List[Tuple[str, str]] = [
     ("What is the weather today?", "dynamic"),
@@ -170,6 +182,111 @@ def train_classifier() -> Pipeline:
     logger.info("Classifier trained successfully")
     return model
 
+def training_data_hash() -> str:
+    """
+    Compute the version key of the classifier artifact.
+
+    The key covers the training set and the scikit-learn version, so an artifact
+    is rebuilt whenever either changes.
+
+    Returns:
+        str: Short hex digest identifying the current training set.
+    """
+    payload = json.dumps({"sklearn": sklearn.__version__, "data": TRAINING_DATA}, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+def model_path() -> str:
+    """
+    Path of the classifier artifact for the current training set.
+
+    Returns:
+        str: Artifact path inside MODEL_DIR.
+    """
+    return os.path.join(MODEL_DIR, f"query_classifier-{training_data_hash()}.joblib")
+
+def save_classifier(model: Pipeline, path: str) -> str:
+    """
+    Atomically write a trained classifier to disk.
+
+    The model is dumped to a temporary file in the target directory and then
+    renamed over the artifact, so readers never observe a partial file.
+
+    Args:
+        model (Pipeline): Trained classifier model.
+        path (str): Destination artifact path.
+
+    Returns:
+        str: Path of the written artifact.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            joblib.dump(model, tmp_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    logger.info(f"Saved classifier artifact: {path}")
+    return path
+
+def build_classifier() -> str:
+    """
+    Train the classifier and persist it as the artifact for the current training set.
+
+    Returns:
+        str: Path of the written artifact.
+    """
+    return save_classifier(train_classifier(), model_path())
+
+_model_lock = threading.Lock()
+# (artifact path, artifact mtime, model) of the currently loaded classifier
+_loaded: Optional[Tuple[str, int, Pipeline]] = None
+
+def _artifact_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def get_classifier() -> Pipeline:
+    """
+    Return the process-wide classifier, loading it from disk on first use.
+
+    The artifact is built if it does not exist yet. When a new artifact is swapped
+    in on disk (e.g. by `python query_classifier.py --rebuild`), the next call picks
+    it up without restarting the process.
+
+    Returns:
+        Pipeline: Trained classifier model shared across sessions.
+    """
+    global _loaded
+    path = model_path()
+    loaded = _loaded
+    if loaded is not None and loaded[0] == path and loaded[1] == _artifact_mtime(path):
+        return loaded[2]
+
+    with _model_lock:
+        mtime = _artifact_mtime(path)
+        if _loaded is not None and _loaded[0] == path and _loaded[1] == mtime:
+            return _loaded[2]
+        if mtime is None:
+            logger.info(f"No classifier artifact at {path}, building it")
+            build_classifier()
+            mtime = _artifact_mtime(path)
+        try:
+            model: Pipeline = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Failed to load classifier artifact {path}: {e}, rebuilding it")
+            build_classifier()
+            mtime = _artifact_mtime(path)
+            model = joblib.load(path)
+        _loaded = (path, mtime, model)
+        logger.info(f"Loaded classifier artifact: {path}")
+        return model
+
 def classify_query(query: str, model: Pipeline) -> str:
     """
     Classify a query as 'static', 'dynamic', or 'sql'.
@@ -186,8 +303,54 @@ def classify_query(query: str, model: Pipeline) -> str:
     logger.info(f"Query classified as: {prediction}")
     return prediction
 
+def classify_query_proba(query: str, model: Pipeline) -> Dict[str, float]:
+    """
+    Score a query against every query type.
+
+    Args:
+        query (str): User input query.
+        model (Pipeline): Trained classifier model.
+
+    Returns:
+        Dict[str, float]: Probability of each query type ('static', 'dynamic', 'sql').
+    """
+    logger.info(f"Scoring query: {query}")
+    probabilities = dict(zip(map(str, model.classes_), model.predict_proba([query])[0].tolist()))
+    logger.info(f"Query type probabilities: {probabilities}")
+    return probabilities
+
+def classify_queries(queries: Iterable[str], model: Pipeline, batch_size: int = 256) -> Iterator[Tuple[str, str, Dict[str, float]]]:
+    """
+    Classify a stream of queries in vectorized batches.
+
+    Each batch is transformed into one sparse TF-IDF matrix and scored with a single
+    predict_proba call. Results are yielded lazily, in input order.
+
+    Args:
+        queries (Iterable[str]): User input queries.
+        model (Pipeline): Trained classifier model.
+        batch_size (int): Number of queries transformed and predicted together.
+
+    Yields:
+        Tuple[str, str, Dict[str, float]]: Query, predicted type and per-class probabilities.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    classes: List[str] = [str(label) for label in model.classes_]
+    iterator = iter(queries)
+    while batch := list(islice(iterator, batch_size)):
+        probabilities = model.predict_proba(batch)
+        best = probabilities.argmax(axis=1)
+        for query, row, index in zip(batch, probabilities.tolist(), best.tolist()):
+            yield query, classes[index], dict(zip(classes, row))
+
 if __name__ == "__main__":
-    model: Pipeline = train_classifier()
+    parser = argparse.ArgumentParser(description="Query classifier utilities.")
+    parser.add_argument("--rebuild", action="store_true", help="Retrain and atomically replace the classifier artifact.")
+    args = parser.parse_args()
+    if args.rebuild:
+        logger.info(f"Classifier artifact rebuilt: {build_classifier()}")
+    model: Pipeline = get_classifier()
     test_query: str = "What is the weather today?"
     result: str = classify_query(test_query, model)
-    logger.info(f"Test query result: {result}")
\ No newline at end of file
+    logger.info(f"Test query result: {result}")
@@ -0,0 +1,243 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from query_classifier import get_classifier
+from result_cache import normalize_query
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_CONFIG = {
+    # Minimum cosine similarity of TF-IDF vectors for a near-duplicate hit
+    "similarity_threshold": 0.9,
+    "max_entries": 512,
+    # Upper bound on the approximate size of cached responses and vectors
+    "max_bytes": 4 * 1024 * 1024,
+    "ttl": 3600.0,
+}
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+# Punctuation that does not change what is asked; other symbols (+, -, <, ...) do
+_IGNORED_TOKENS = frozenset("?!.,;:'\"")
+# Contractions like "what's" or "you're" ask the same as their long forms; "n't" is kept
+_CLITIC = re.compile(r"['’](s|re|m|ll|ve|d)\b")
+
+QuerySignature = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+def _same_order(first: Sequence[str], second: Sequence[str]) -> bool:
+    """Whether the tokens two sequences share appear in the same order in both."""
+    shared = set(first) & set(second)
+    return [token for token in first if token in shared] == [token for token in second if token in shared]
+
+class _Entry:
+    """A cached response with the query vector and signature it was generated for."""
+
+    __slots__ = ("response", "vector", "signature", "expires", "cost", "size")
+
+    def __init__(self, response: str, vector: sp.csr_matrix, signature: QuerySignature, expires: float, cost: float):
+        self.response = response
+        self.vector = vector
+        self.signature = signature
+        self.expires = expires
+        self.cost = cost
+        self.size = len(response.encode("utf-8")) + vector.data.nbytes + vector.indices.nbytes + 64
+
+class SemanticResponseCache:
+    """
+    LRU/TTL cache of static LLM answers matched by text or by query similarity.
+
+    A lookup first tries the normalized query text, then the most similar cached
+    query in the classifier's TF-IDF space. That space ignores word order, and
+    numbers, one-character tokens, symbols and words unknown to the vectorizer
+    carry no weight in it. Every hit therefore also requires the same sequence of
+    those discarded tokens and the same order of shared content words; otherwise
+    "what is 2+3" would match "what is 2+5" and "is A bigger than B" would match
+    "is B bigger than A".
+    """
+
+    def __init__(
+        self,
+        vectorizer: TfidfVectorizer,
+        similarity_threshold: float = 0.9,
+        max_entries: int = 512,
+        max_bytes: int = 4 * 1024 * 1024,
+        ttl: float = 3600.0,
+    ):
+        self.vectorizer = vectorizer
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._matrix: Optional[sp.csr_matrix] = None
+        self._matrix_keys: list = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    def _signature(self, query: str) -> QuerySignature:
+        """Content words the vectorizer weighs and every token it discards, both in query order."""
+        content: List[str] = []
+        discarded: List[str] = []
+        for token in _TOKEN.findall(_CLITIC.sub("", query.lower())):
+            if token in _IGNORED_TOKENS:
+                continue
+            if len(token) > 1 and not any(char.isdigit() for char in token) and token in self.vectorizer.vocabulary_:
+                content.append(token)
+            else:
+                discarded.append(token)
+        return tuple(content), tuple(discarded)
+
+    @staticmethod
+    def _matches(entry: _Entry, signature: QuerySignature) -> bool:
+        return entry.signature[1] == signature[1] and _same_order(entry.signature[0], signature[0])
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry. Caller must hold the lock."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        self._matrix = None
+
+    def _similar(self, vector: sp.csr_matrix, signature: QuerySignature) -> Optional[str]:
+        """Key of the most similar cached query above the threshold. Caller must hold the lock."""
+        if vector.nnz == 0 or not self._entries:
+            return None
+        if self._matrix is None:
+            self._matrix_keys = list(self._entries)
+            self._matrix = sp.vstack([self._entries[key].vector for key in self._matrix_keys], format="csr")
+        # TF-IDF rows are L2-normalized, so the dot product is the cosine similarity
+        similarities = (self._matrix @ vector.T).toarray().ravel()
+        for index in similarities.argsort()[::-1]:
+            if similarities[index] < self.similarity_threshold:
+                return None
+            key = self._matrix_keys[index]
+            if self._matches(self._entries[key], signature):
+                return key
+        return None
+
+    def lookup(self, query: str) -> Optional[str]:
+        """
+        Return a cached response for the query or a near-identical one.
+
+        Args:
+            query (str): User query.
+
+        Returns:
+            Optional[str]: Cached response, or None on a miss.
+        """
+        key = normalize_query(query)
+        signature = self._signature(query)
+        now = time.monotonic()
+        with self._lock:
+            for expired in [cached for cached, entry in self._entries.items() if entry.expires <= now]:
+                self._remove(expired)
+            entry = self._entries.get(key)
+            if entry is not None and self._matches(entry, signature):
+                self.exact_hits += 1
+            else:
+                similar = self._similar(self.vectorizer.transform([query]), signature)
+                if similar is None:
+                    self.misses += 1
+                    return None
+                entry = self._entries[similar]
+                key = similar
+                self.similar_hits += 1
+            self._entries.move_to_end(key)
+            self.latency_saved += entry.cost
+            return entry.response
+
+    def store(self, query: str, response: str, cost: float = 0.0) -> None:
+        """
+        Cache a response.
+
+        Args:
+            query (str): User query the response answers.
+            response (str): Generated response.
+            cost (float): Seconds it took to generate, credited as saved on each hit.
+        """
+        key = normalize_query(query)
+        entry = _Entry(
+            response,
+            self.vectorizer.transform([query]).tocsr(),
+            self._signature(query),
+            time.monotonic() + self.ttl,
+            cost,
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._matrix = None
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def get_or_compute(self, query: str, compute: Callable[[], str]) -> str:
+        """
+        Return the cached response for a query, generating and caching it on a miss.
+
+        Args:
+            query (str): User query.
+            compute (Callable[[], str]): Generates the response on a miss.
+
+        Returns:
+            str: Cached or freshly generated response.
+        """
+        cached = self.lookup(query)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        response = compute()
+        self.store(query, response, time.perf_counter() - start)
+        return response
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Cache counters.
+
+        Returns:
+            Dict[str, float]: Exact and similarity hits, misses, hit rate, seconds of generation saved and size.
+        """
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.similar_hits) / lookups if lookups else 0.0,
+                "latency_saved": self.latency_saved,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+_cache_lock = threading.Lock()
+_response_cache: Optional[SemanticResponseCache] = None
+
+def get_response_cache() -> SemanticResponseCache:
+    """
+    Return the process-wide static response cache.
+
+    The cache shares the TF-IDF vectorizer of the loaded classifier and starts
+    empty again when a new classifier artifact is swapped in.
+
+    Returns:
+        SemanticResponseCache: Shared cache.
+    """
+    global _response_cache
+    vectorizer = get_classifier().named_steps["tfidfvectorizer"]
+    cache = _response_cache
+    if cache is not None and cache.vectorizer is vectorizer:
+        return cache
+    with _cache_lock:
+        if _response_cache is None or _response_cache.vectorizer is not vectorizer:
+            _response_cache = SemanticResponseCache(vectorizer, **RESPONSE_CACHE_CONFIG)
+        return _response_cache
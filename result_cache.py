@@ -0,0 +1,337 @@
+import asyncio
+import logging
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+# Seconds a cached result stays fresh, per query category
+CACHE_TTLS: Dict[str, float] = {
+    "weather": 600.0,
+    "currency": 300.0,
+    "news": 1800.0,
+    "default": 900.0,
+}
+
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "weather": ["weather", "forecast", "temperature", "rain", "humidity"],
+    "currency": ["rate", "exchange", "usd", "eur", "inr", "gbp", "jpy", "cny", "bitcoin", "price", "stock", "stocks", "cost"],
+    "news": ["news", "headlines", "latest", "updates", "happened", "election"],
+}
+
+CACHE_CONFIG = {
+    "max_entries": 1024,
+    # Path of an SQLite file to persist entries across restarts, or None for memory only
+    "db_path": None,
+}
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different phrasings share a cache key.
+
+    Args:
+        query (str): User query.
+
+    Returns:
+        str: Lowercased query without punctuation and repeated whitespace.
+    """
+    query = query.lower().replace("’", "'")
+    query = re.sub(r"[^\w\s'@.-]|(?<!\w)[.'-]|[.'-](?!\w)", " ", query)
+    return " ".join(query.split())
+
+def query_category(normalized_query: str) -> str:
+    """
+    Pick the TTL category of a normalized query.
+
+    Args:
+        normalized_query (str): Output of normalize_query().
+
+    Returns:
+        str: Key of CACHE_TTLS.
+    """
+    words = set(normalized_query.split())
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        if words.intersection(keywords):
+            return category
+    return "default"
+
+class _InFlight:
+    """A computation other callers with the same key wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[Exception] = None
+        # Set when the leader was cancelled, so a waiting caller computes the value instead
+        self.abandoned = False
+
+class ResultCache:
+    """
+    Thread-safe TTL + LRU cache keyed by normalized query.
+
+    Concurrent misses for the same key are coalesced: one caller computes the
+    value while the others wait for it. Entries can optionally be persisted to
+    an SQLite file so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        db_path: Optional[str] = None,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttls = dict(ttls or CACHE_TTLS)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache "
+                "(cache TEXT, key TEXT, expires REAL, value BLOB, PRIMARY KEY (cache, key))"
+            )
+            self._db.commit()
+
+    def _ttl(self, key: str) -> float:
+        return self.ttls.get(query_category(key), self.ttls["default"])
+
+    def _lookup(self, key: str, now: float) -> Tuple[bool, Any]:
+        """Find a fresh entry in memory or on disk. Caller must hold the lock."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return True, entry[1]
+            del self._entries[key]
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT expires, value FROM result_cache WHERE cache = ? AND key = ?", (self.name, key)
+            ).fetchone()
+            if row is not None and row[0] > now:
+                value = pickle.loads(row[1])
+                self._store(key, value, row[0], persist=False)
+                return True, value
+        return False, None
+
+    def _store(self, key: str, value: Any, expires: float, persist: bool = True) -> None:
+        """Insert an entry and enforce the size bound. Caller must hold the lock."""
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        if persist and self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO result_cache (cache, key, expires, value) VALUES (?, ?, ?, ?)",
+                (self.name, key, expires, pickle.dumps(value)),
+            )
+            self._db.execute("DELETE FROM result_cache WHERE cache = ? AND expires <= ?", (self.name, time.time()))
+            self._db.commit()
+
+    def get(self, query: str) -> Optional[Any]:
+        """
+        Return the fresh cached value for a query, if any.
+
+        Args:
+            query (str): User query.
+
+        Returns:
+            Optional[Any]: Cached value or None.
+        """
+        key = normalize_query(query)
+        with self._lock:
+            found, value = self._lookup(key, time.time())
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def put(self, query: str, value: Any) -> None:
+        """
+        Cache a value for a query with its category's TTL.
+
+        Args:
+            query (str): User query.
+            value (Any): Value to cache.
+        """
+        key = normalize_query(query)
+        with self._lock:
+            self._store(key, value, time.time() + self._ttl(key))
+
+    def _join(self, query: str) -> Tuple[str, bool, Any, Optional[_InFlight], bool]:
+        """Look up a key, registering an in-flight computation on a miss."""
+        key = normalize_query(query)
+        with self._lock:
+            found, value = self._lookup(key, time.time())
+            if found:
+                self.hits += 1
+                return key, True, value, None, False
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                self.misses += 1
+                inflight = self._inflight[key] = _InFlight()
+                return key, False, None, inflight, True
+            self.coalesced += 1
+            return key, False, None, inflight, False
+
+    def _settle(self, key: str, inflight: _InFlight, cache_if: Optional[Callable[[Any], bool]]) -> None:
+        """Store the leader's value if it may be cached and wake up waiting callers."""
+        with self._lock:
+            if inflight.error is None and not inflight.abandoned and (cache_if is None or cache_if(inflight.value)):
+                self._store(key, inflight.value, time.time() + self._ttl(key))
+            del self._inflight[key]
+        inflight.done.set()
+
+    @staticmethod
+    def _result(inflight: _InFlight) -> Any:
+        if inflight.error is not None:
+            raise inflight.error
+        return inflight.value
+
+    def get_or_compute(self, query: str, compute: Callable[[], Any], cache_if: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        Return the cached value for a query, computing it once on a miss.
+
+        Callers that miss while the same key is already being computed wait for
+        that computation instead of starting their own. If it is cancelled
+        rather than failing, one of them takes it over.
+
+        Args:
+            query (str): User query.
+            compute (Callable[[], Any]): Produces the value on a miss.
+            cache_if (Optional[Callable[[Any], bool]]): Predicate deciding whether a computed value is cached.
+
+        Returns:
+            Any: Cached or freshly computed value.
+        """
+        while True:
+            key, found, value, inflight, leader = self._join(query)
+            if found:
+                return value
+            if leader:
+                break
+            inflight.done.wait()
+            if not inflight.abandoned:
+                return self._result(inflight)
+
+        try:
+            inflight.value = compute()
+        except Exception as e:
+            inflight.error = e
+            raise
+        except BaseException:
+            # Interrupted rather than failed: nothing for waiting callers to re-raise
+            inflight.abandoned = True
+            raise
+        finally:
+            self._settle(key, inflight, cache_if)
+        return inflight.value
+
+    async def get_or_compute_async(
+        self,
+        query: str,
+        compute: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Async variant of get_or_compute, coalescing with sync and async callers alike.
+
+        When the computing task is cancelled, e.g. as the losing route of a
+        speculative race, callers waiting on it are not: one of them computes
+        the value instead.
+
+        Args:
+            query (str): User query.
+            compute (Callable[[], Awaitable[Any]]): Produces the value on a miss.
+            cache_if (Optional[Callable[[Any], bool]]): Predicate deciding whether a computed value is cached.
+
+        Returns:
+            Any: Cached or freshly computed value.
+        """
+        while True:
+            key, found, value, inflight, leader = self._join(query)
+            if found:
+                return value
+            if leader:
+                break
+            await asyncio.to_thread(inflight.done.wait)
+            if not inflight.abandoned:
+                return self._result(inflight)
+
+        try:
+            inflight.value = await compute()
+        except Exception as e:
+            inflight.error = e
+            raise
+        except BaseException:
+            # Cancelled: waiting callers were not, so one of them takes over
+            inflight.abandoned = True
+            raise
+        finally:
+            self._settle(key, inflight, cache_if)
+        return inflight.value
+
+    def clear(self) -> None:
+        """Drop all entries, including persisted ones."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM result_cache WHERE cache = ?", (self.name,))
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, coalesced waits, evictions and current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+_caches_lock = threading.Lock()
+_caches: Dict[str, ResultCache] = {}
+
+def get_result_cache(name: str) -> ResultCache:
+    """
+    Return the process-wide cache with the given name, creating it from CACHE_CONFIG.
+
+    Args:
+        name (str): Cache name, e.g. "scrape".
+
+    Returns:
+        ResultCache: Shared cache.
+    """
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = ResultCache(name, **CACHE_CONFIG)
+        return _caches[name]
+
+if __name__ == "__main__":
+    cache = get_result_cache("demo")
+    for query in ["What is the weather today?", "what is the weather today", "USD rate in INR"]:
+        value = cache.get_or_compute(query, lambda: f"computed for {query}")
+        logger.info(f"{query!r} [{query_category(normalize_query(query))}] -> {value}")
+    logger.info(f"Cache stats: {cache.stats()}")
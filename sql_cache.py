@@ -0,0 +1,242 @@
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from sql_templates import parse_schema
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+SQL_CACHE_CONFIG = {
+    "max_entries": 256,
+}
+
+# Values in a question that vary between otherwise identical requests
+_LITERAL = re.compile(
+    r"'([^']*)'|\"([^\"]*)\"|([\w.+-]+@[\w-]+\.[\w.-]+)|(\d{4}-\d{2}-\d{2})|(?<![\w.])(-?\d+(?:\.\d+)?)(?![\w.])"
+)
+_STATEMENT = re.compile(r"^\s*(?:select|insert|update|delete|with)\b", re.I)
+_TABLE_REFERENCE = re.compile(r"\b(?:from|join|into|update)\s+`?(\w+)`?", re.I)
+_CODE_FENCE = re.compile(r"```(?:sql)?\s*(.*?)```", re.I | re.S)
+_STRING_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"")
+
+class PreparedSql(NamedTuple):
+    """Generated SQL with the question's literals replaced by %s placeholders."""
+
+    sql: str
+    # Index into the question's literals of each placeholder, in placeholder order
+    order: Tuple[int, ...]
+
+def question_signature(question: str) -> Tuple[str, List[Any]]:
+    """
+    Strip literals from a question so parameter variants share one signature.
+
+    "Delete user with ID 2" and "Delete user with ID 3" both become "delete user with id <value>".
+
+    Args:
+        question (str): User query.
+
+    Returns:
+        Tuple[str, List[Any]]: Signature and the literals in order of appearance.
+    """
+    literals: List[Any] = []
+
+    def replace(match: re.Match) -> str:
+        quoted, double_quoted, email, date, number = match.groups()
+        if number is not None:
+            literals.append(float(number) if "." in number else int(number))
+        else:
+            literals.append(next(value for value in (quoted, double_quoted, email, date) if value is not None))
+        return "<value>"
+
+    signature = _LITERAL.sub(replace, question)
+    return " ".join(signature.lower().split()).rstrip(" ?.!;"), literals
+
+def schema_hash(db_schema: str) -> str:
+    """Fingerprint of a schema description, ignoring whitespace."""
+    return hashlib.sha256(" ".join(db_schema.split()).encode("utf-8")).hexdigest()
+
+def _clean_sql(sql: str) -> str:
+    fenced = _CODE_FENCE.search(sql)
+    if fenced:
+        sql = fenced.group(1)
+    return sql.strip().rstrip(";").strip()
+
+def _literal_positions(sql: str, value: Any) -> List[Tuple[int, int]]:
+    """Spans of a question literal written as an SQL literal."""
+    text = re.escape(str(value))
+    pattern = rf"'{text}'|\"{text}\""
+    if isinstance(value, (int, float)):
+        pattern += rf"|(?<![\w.'\"]){text}(?![\w.'\"])"
+    return [match.span() for match in re.finditer(pattern, sql)]
+
+def _inside_string(span: Tuple[int, int], strings: List[Tuple[int, int]]) -> bool:
+    """Whether a span is part of, but not all of, an SQL string literal, e.g. the 3 in 'Widget 3 Pro'."""
+    return any(start <= span[0] and span[1] <= end and span != (start, end) for start, end in strings)
+
+def prepare_sql(sql: str, literals: List[Any], db_schema: str) -> Optional[PreparedSql]:
+    """
+    Validate generated SQL and turn the question's literals into placeholders.
+
+    The SQL is reusable only if it is a single SELECT/INSERT/UPDATE/DELETE over
+    schema tables and every literal of the question appears in it exactly once,
+    as a whole SQL literal rather than inside a longer string; otherwise a
+    different question with the same signature could get wrong SQL.
+
+    Args:
+        sql (str): SQL generated by the LLM.
+        literals (List[Any]): Literals of the question it was generated for.
+        db_schema (str): Database schema description.
+
+    Returns:
+        Optional[PreparedSql]: Parameterized SQL, or None if it cannot be reused.
+    """
+    sql = _clean_sql(sql)
+    if not _STATEMENT.match(sql) or ";" in sql or "%" in sql:
+        return None
+    tables = parse_schema(db_schema)
+    referenced = _TABLE_REFERENCE.findall(sql)
+    if not referenced or any(table.lower() not in tables for table in referenced):
+        return None
+
+    strings = [match.span() for match in _STRING_LITERAL.finditer(sql)]
+    spans: List[Tuple[int, int, int]] = []
+    for index, value in enumerate(literals):
+        positions = _literal_positions(sql, value)
+        if len(positions) != 1 or _inside_string(positions[0], strings):
+            return None
+        spans.append((*positions[0], index))
+    spans.sort()
+    if any(end > start for (_, end, _), (start, _, _) in zip(spans, spans[1:])):
+        return None
+
+    parts: List[str] = []
+    last = 0
+    for start, end, _ in spans:
+        parts.append(sql[last:start])
+        parts.append("%s")
+        last = end
+    parts.append(sql[last:])
+    return PreparedSql("".join(parts), tuple(index for _, _, index in spans))
+
+class SqlStatementCache:
+    """
+    LRU cache of LLM-generated SQL keyed by literal-stripped question signature.
+
+    Entries are validated and parameterized once when stored; a later question
+    with the same signature reuses the statement with its own literals bound.
+    The cache empties itself when it is used with a different schema.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, PreparedSql]" = OrderedDict()
+        self._schema_hash: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_schema(self, db_schema: str) -> None:
+        """Drop all entries if the schema changed. Caller must hold the lock."""
+        fingerprint = schema_hash(db_schema)
+        if fingerprint != self._schema_hash:
+            if self._entries:
+                logger.info(f"Schema changed, dropping {len(self._entries)} cached SQL statements")
+                self.invalidations += 1
+            self._entries.clear()
+            self._schema_hash = fingerprint
+
+    def lookup(self, question: str, db_schema: str) -> Optional[Tuple[str, Tuple[Any, ...]]]:
+        """
+        Return cached SQL for a question with its literals bound.
+
+        Args:
+            question (str): User query.
+            db_schema (str): Database schema description.
+
+        Returns:
+            Optional[Tuple[str, Tuple[Any, ...]]]: SQL and parameters, or None on a miss.
+        """
+        signature, literals = question_signature(question)
+        with self._lock:
+            self._check_schema(db_schema)
+            prepared = self._entries.get(signature)
+            if prepared is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(signature)
+            self.hits += 1
+        return prepared.sql, tuple(literals[index] for index in prepared.order)
+
+    def store(self, question: str, db_schema: str, sql: str) -> Optional[Tuple[str, Tuple[Any, ...]]]:
+        """
+        Cache generated SQL if it can be reused for other literals.
+
+        Args:
+            question (str): User query the SQL was generated for.
+            db_schema (str): Database schema description.
+            sql (str): SQL generated by the LLM.
+
+        Returns:
+            Optional[Tuple[str, Tuple[Any, ...]]]: Parameterized SQL and this question's parameters,
+            or None if the SQL was not cacheable.
+        """
+        signature, literals = question_signature(question)
+        prepared = prepare_sql(sql, literals, db_schema)
+        with self._lock:
+            self._check_schema(db_schema)
+            if prepared is None:
+                self.uncacheable += 1
+                return None
+            self._entries[signature] = prepared
+            self._entries.move_to_end(signature)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        logger.info(f"Cached SQL for '{signature}': {prepared.sql}")
+        return prepared.sql, tuple(literals[index] for index in prepared.order)
+
+    def clear(self) -> None:
+        """Drop all cached statements."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, uncacheable generations, evictions, invalidations and size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncacheable": self.uncacheable,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+_cache_lock = threading.Lock()
+_sql_cache: Optional[SqlStatementCache] = None
+
+def get_sql_cache() -> SqlStatementCache:
+    """
+    Return the process-wide generated SQL cache.
+
+    Returns:
+        SqlStatementCache: Shared cache configured from SQL_CACHE_CONFIG.
+    """
+    global _sql_cache
+    if _sql_cache is None:
+        with _cache_lock:
+            if _sql_cache is None:
+                _sql_cache = SqlStatementCache(**SQL_CACHE_CONFIG)
+    return _sql_cache
@@ -0,0 +1,176 @@
+import logging
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from metrics import METRICS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+class SqlTemplateMatch(NamedTuple):
+    """Parameterized SQL resolved from a question without calling the LLM."""
+
+    intent: str
+    sql: str
+    params: Tuple[Any, ...]
+
+# Trailing phrases that do not change the meaning of a database question
+_SUFFIX = r"(?:\s+(?:in|of|from|into|to)\s+(?:the\s+|my\s+)?database|\s+table)?"
+_VERB = r"(?:write\s+a\s+query\s+to\s+)?"
+
+_LIST = re.compile(rf"^{_VERB}(?:show|list|display|get|see|fetch|give)(?:\s+me)?(?:\s+all)?(?:\s+of)?(?:\s+the)?\s+(\w+){_SUFFIX}$", re.I)
+_COUNT = re.compile(rf"^{_VERB}(?:show|get|give|find|what\s+is|count)?(?:\s+me)?(?:\s+the)?\s*(?:total\s+)?(?:number|count)\s+of\s+(?:all\s+)?(?:the\s+)?(\w+){_SUFFIX}$", re.I)
+_HOW_MANY = re.compile(rf"^how\s+many\s+(\w+)(?:\s+are\s+there)?{_SUFFIX}$", re.I)
+_GET_BY_ID = re.compile(rf"^{_VERB}(?:show|get|find|fetch|display)(?:\s+me)?(?:\s+the)?\s+(\w+)\s+(?:with\s+)?id\s+(\d+){_SUFFIX}$", re.I)
+_DELETE_BY_ID = re.compile(rf"^{_VERB}(?:delete|remove)(?:\s+the)?\s+(\w+)\s+(?:with\s+)?id\s+(\d+){_SUFFIX}$", re.I)
+# One new value: a quoted string or a single token. Anything after it ("and email ...",
+# ", age 3", "where ...") leaves the question to the LLM rather than writing it into the column.
+_VALUE = r"""('[^']*'|"[^"]*"|(?!(?:and|or|where)\b)[^\s'",]+)"""
+_UPDATE_BY_ID = re.compile(
+    rf"^{_VERB}update(?:\s+the)?\s+(\w+)\s+(?:with\s+)?id\s+(\d+)\s+to\s+(?:have|set)(?:\s+the)?(?:\s+an?)?\s+(\w+)(?:\s+(?:to|=|as))?\s+{_VALUE}{_SUFFIX}$",
+    re.I,
+)
+_BY_PARENT = re.compile(rf"^{_VERB}(?:show|list|get|find|display)(?:\s+me)?(?:\s+all)?(?:\s+the)?\s+(\w+)\s+(?:placed\s+|made\s+)?(?:by|for|of)\s+(?:the\s+)?(\w+)\s+(?:with\s+)?id\s+(\d+){_SUFFIX}$", re.I)
+_BY_PRICE = re.compile(
+    rf"^{_VERB}(?:show|list|get|find|display)(?:\s+me)?(?:\s+all)?(?:\s+the)?\s+(\w+)\s+(?:that\s+|which\s+)?(?:costs?|priced|with\s+(?:a\s+)?price)"
+    rf"\s+(more|greater|less|lower|over|under|above|below)(?:\s+than)?\s+\$?(\d+(?:\.\d+)?){_SUFFIX}$",
+    re.I,
+)
+_INSERT = re.compile(rf"^{_VERB}(?:insert|add|create)\s+(?:a\s+)?(?:new\s+)?(\w+)\s+with\s+(.+?){_SUFFIX}$", re.I)
+
+_COMPARISONS = {"more": ">", "greater": ">", "over": ">", "above": ">", "less": "<", "lower": "<", "under": "<", "below": "<"}
+
+@lru_cache(maxsize=8)
+def parse_schema(db_schema: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Read table and column names from a DB_SCHEMA description.
+
+    Args:
+        db_schema (str): Lines like "users (id INT, name VARCHAR, email VARCHAR)".
+
+    Returns:
+        Dict[str, Tuple[str, ...]]: Columns per table.
+    """
+    tables: Dict[str, Tuple[str, ...]] = {}
+    for name, columns in re.findall(r"^\s*(\w+)\s*\(([^)]*)\)", db_schema, re.M):
+        tables[name.lower()] = tuple(column.split()[0].lower() for column in columns.split(",") if column.strip())
+    return tables
+
+def _table(word: str, tables: Dict[str, Tuple[str, ...]]) -> Optional[str]:
+    """Map a singular or plural noun to a schema table."""
+    word = word.lower()
+    for candidate in (word, f"{word}s", word[:-1] if word.endswith("s") else word):
+        if candidate in tables:
+            return candidate
+    return None
+
+def _literal(text: str) -> Any:
+    """Convert a literal from the question to a bound parameter."""
+    text = text.strip().strip("'\"")
+    if re.fullmatch(r"-?\d+", text):
+        return int(text)
+    if re.fullmatch(r"-?\d+\.\d+", text):
+        return float(text)
+    return text
+
+def _insert(table: str, assignments: str, columns: Tuple[str, ...]) -> Optional[SqlTemplateMatch]:
+    names: List[str] = []
+    values: List[Any] = []
+    for part in re.split(r"\s*,\s*(?:and\s+)?|\s+and\s+", assignments):
+        column, _, value = part.partition(" ")
+        column = column.lower()
+        if column not in columns or column == "id" or not value.strip() or column in names:
+            return None
+        names.append(column)
+        values.append(_literal(value))
+    if not names:
+        return None
+    placeholders = ", ".join(["%s"] * len(names))
+    return SqlTemplateMatch("insert", f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})", tuple(values))
+
+def _resolve(question: str, tables: Dict[str, Tuple[str, ...]]) -> Optional[SqlTemplateMatch]:
+    if match := _COUNT.match(question) or _HOW_MANY.match(question):
+        if table := _table(match.group(1), tables):
+            return SqlTemplateMatch("count", f"SELECT COUNT(*) AS total FROM {table}", ())
+    if match := _LIST.match(question):
+        if table := _table(match.group(1), tables):
+            return SqlTemplateMatch("list", f"SELECT * FROM {table}", ())
+    if match := _GET_BY_ID.match(question):
+        if (table := _table(match.group(1), tables)) and "id" in tables[table]:
+            return SqlTemplateMatch("get_by_id", f"SELECT * FROM {table} WHERE id = %s", (int(match.group(2)),))
+    if match := _DELETE_BY_ID.match(question):
+        if (table := _table(match.group(1), tables)) and "id" in tables[table]:
+            return SqlTemplateMatch("delete_by_id", f"DELETE FROM {table} WHERE id = %s", (int(match.group(2)),))
+    if match := _UPDATE_BY_ID.match(question):
+        table = _table(match.group(1), tables)
+        column = match.group(3).lower()
+        if table and "id" in tables[table] and column in tables[table] and column != "id":
+            return SqlTemplateMatch(
+                "update_by_id",
+                f"UPDATE {table} SET {column} = %s WHERE id = %s",
+                (_literal(match.group(4)), int(match.group(2))),
+            )
+    if match := _BY_PARENT.match(question):
+        table, parent = _table(match.group(1), tables), _table(match.group(2), tables)
+        if table and parent:
+            foreign_key = f"{parent[:-1] if parent.endswith('s') else parent}_id"
+            if foreign_key in tables[table]:
+                return SqlTemplateMatch("filter_by_parent", f"SELECT * FROM {table} WHERE {foreign_key} = %s", (int(match.group(3)),))
+    if match := _BY_PRICE.match(question):
+        if (table := _table(match.group(1), tables)) and "price" in tables[table]:
+            operator = _COMPARISONS[match.group(2).lower()]
+            return SqlTemplateMatch("filter_by_price", f"SELECT * FROM {table} WHERE price {operator} %s", (_literal(match.group(3)),))
+    if match := _INSERT.match(question):
+        if table := _table(match.group(1), tables):
+            return _insert(table, match.group(2), tables[table])
+    return None
+
+_stats_lock = threading.Lock()
+_stats = {"template": 0, "llm": 0}
+
+def match_sql_template(question: str, db_schema: str) -> Optional[SqlTemplateMatch]:
+    """
+    Resolve a common database question to parameterized SQL without the LLM.
+
+    Handles listing a table, counting rows, get/update/delete by ID, filtering by a
+    parent ID or by price, and simple inserts. Table and column names come only from
+    the schema; literals from the question are returned as bound parameters.
+
+    Args:
+        question (str): User query.
+        db_schema (str): Database schema description.
+
+    Returns:
+        Optional[SqlTemplateMatch]: Resolved SQL, or None if the LLM is needed.
+    """
+    normalized = " ".join(question.split()).rstrip(" ?.!;")
+    with METRICS.stage("sql_template"):
+        match = _resolve(normalized, parse_schema(db_schema))
+    with _stats_lock:
+        _stats["template" if match else "llm"] += 1
+    if match:
+        logger.info(f"Resolved SQL template {match.intent}: {match.sql} {match.params}")
+    return match
+
+def template_stats() -> Dict[str, float]:
+    """
+    Share of SQL questions served by templates.
+
+    Returns:
+        Dict[str, float]: Template hits, LLM fallbacks and the template fraction.
+    """
+    with _stats_lock:
+        total = _stats["template"] + _stats["llm"]
+        return {**_stats, "template_fraction": _stats["template"] / total if total else 0.0}
+
+if __name__ == "__main__":
+    from db_handler import DB_SCHEMA
+    from query_classifier import TRAINING_DATA
+
+    for query, label in TRAINING_DATA:
+        if label == "sql":
+            match = match_sql_template(query, DB_SCHEMA)
+            logger.info(f"{query!r} -> {match.sql if match else 'LLM'} {match.params if match else ''}")
+    logger.info(f"Template stats: {template_stats()}")
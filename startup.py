@@ -0,0 +1,147 @@
+import importlib
+import logging
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+# Modules each part of the app needs; they are imported on first use instead of at startup
+ROUTE_MODULES: Dict[str, List[str]] = {
+    "classifier": ["query_classifier"],
+    "static": ["llm_processor", "response_cache"],
+    "dynamic": ["web_scraper", "llm_processor"],
+    "sql": ["db_handler", "sql_templates", "sql_cache"],
+}
+
+WARMUP_CONFIG = {
+    # Routes pre-initialized in the background once the UI has rendered
+    "routes": ["classifier", "static", "dynamic", "sql"],
+}
+
+_import_lock = threading.Lock()
+_import_times: Dict[str, float] = {}
+_loaded_routes: set = set()
+
+def route_loaded(route: str) -> bool:
+    """Whether the modules of a route have been imported."""
+    return route in _loaded_routes
+
+def load_route(route: str) -> None:
+    """
+    Import the modules of a route, recording how long each first import took.
+
+    Args:
+        route (str): Key of ROUTE_MODULES, e.g. "static".
+    """
+    if route in _loaded_routes:
+        return
+    with _import_lock:
+        for module in ROUTE_MODULES[route]:
+            if module in sys.modules:
+                continue
+            start = time.perf_counter()
+            importlib.import_module(module)
+            _import_times[module] = time.perf_counter() - start
+            logger.info(f"Imported {module} in {_import_times[module]:.3f}s")
+        _loaded_routes.add(route)
+
+def import_profile() -> Dict[str, float]:
+    """
+    Seconds spent importing each lazily loaded module, including dependencies it imported first.
+
+    Returns:
+        Dict[str, float]: Import time per module, slowest first.
+    """
+    with _import_lock:
+        return dict(sorted(_import_times.items(), key=lambda item: item[1], reverse=True))
+
+def _warm_route(route: str) -> None:
+    load_route(route)
+    if route == "classifier":
+        from query_classifier import get_classifier
+        get_classifier()
+    elif route == "static":
+        from llm_clients import get_llm_client
+        from llm_processor import STATIC_MODEL
+        from response_cache import get_response_cache
+        get_response_cache()
+        get_llm_client(STATIC_MODEL)
+    elif route == "dynamic":
+        from llm_clients import get_llm_client
+        from llm_processor import DYNAMIC_MODEL
+        from web_scraper import get_scraper_backends
+        get_scraper_backends()
+        get_llm_client(DYNAMIC_MODEL)
+
+_warmup_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+
+def warm_up(routes: Optional[Sequence[str]] = None) -> threading.Thread:
+    """
+    Import and initialize backends in a background thread.
+
+    Loads the classifier artifact, the static response cache, scraper backends and
+    LLM clients so the first query of each route does not pay for them. Safe to
+    call on every Streamlit rerun: only the first call starts a thread.
+
+    Args:
+        routes (Optional[Sequence[str]]): Routes to warm up. Defaults to WARMUP_CONFIG["routes"].
+
+    Returns:
+        threading.Thread: The warm-up thread.
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+
+        def run() -> None:
+            start = time.perf_counter()
+            for route in routes or WARMUP_CONFIG["routes"]:
+                try:
+                    _warm_route(route)
+                except Exception as e:
+                    logger.warning(f"Warm-up of {route} route failed: {e}")
+            logger.info(f"Warm-up finished in {time.perf_counter() - start:.3f}s: {import_profile()}")
+
+        _warmup_thread = threading.Thread(target=run, name="backend-warmup", daemon=True)
+        _warmup_thread.start()
+        return _warmup_thread
+
+def profile_entry_point(module: str = "main", top: int = 15) -> List[Tuple[str, float, float]]:
+    """
+    Import a module in a fresh interpreter with -X importtime and list its slowest imports.
+
+    Args:
+        module (str): Module to import, e.g. "main".
+        top (int): Number of modules to report.
+
+    Returns:
+        List[Tuple[str, float, float]]: Module name, self seconds and cumulative seconds, by cumulative time.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows: List[Tuple[str, float, float]] = []
+    for line in completed.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.+)$", line)
+        if match:
+            rows.append((match.group(3).strip(), int(match.group(1)) / 1e6, int(match.group(2)) / 1e6))
+    return sorted(rows, key=lambda row: row[2], reverse=True)[:top]
+
+if __name__ == "__main__":
+    for name, self_time, cumulative in profile_entry_point():
+        logger.info(f"{cumulative * 1000:9.1f}ms cumulative {self_time * 1000:9.1f}ms self  {name}")
+    for route in ROUTE_MODULES:
+        load_route(route)
+    for name, seconds in import_profile().items():
+        logger.info(f"Lazy import of {name}: {seconds * 1000:.1f}ms")
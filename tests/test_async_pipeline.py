@@ -0,0 +1,32 @@
+import time
+import async_pipeline
+from async_pipeline import route_speculatively_async, run_coroutine, run_stage, speculation_stats
+from metrics import METRICS
+
+ROUTE_SECONDS = {"static": 0.05, "dynamic": 0.5}
+
+def _answer(route: str) -> str:
+    time.sleep(ROUTE_SECONDS[route])
+    return f"{route} answer"
+
+async def _fake_route(query: str, route: str, history: str = "") -> str:
+    return await run_stage("classify", "classifier", _answer, route)
+
+def test_losing_route_is_measured_until_its_worker_thread_finishes(monkeypatch):
+    monkeypatch.setattr(async_pipeline, "route_query_async", _fake_route)
+    METRICS.reset()
+    extra_before = speculation_stats()["extra_seconds"]
+
+    start = time.perf_counter()
+    answer = run_coroutine(route_speculatively_async("Is it raining?", ["static", "dynamic"]))
+
+    assert answer == "static answer"
+    assert time.perf_counter() - start < ROUTE_SECONDS["dynamic"]
+    deadline = time.monotonic() + 5
+    while speculation_stats()["extra_seconds"] == extra_before:
+        assert time.monotonic() < deadline, "losing route was never recorded"
+        time.sleep(0.01)
+    assert speculation_stats()["extra_seconds"] - extra_before >= ROUTE_SECONDS["dynamic"]
+    [extra] = [entry for entry in METRICS.to_json()["router_stage_seconds"] if entry["labels"]["stage"] == "speculation_extra"]
+    assert extra["labels"]["route"] == "dynamic"
+    assert extra["sum"] >= ROUTE_SECONDS["dynamic"]
@@ -0,0 +1,83 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+import ollama
+import pytest
+from benchmarks.fake_ollama import FakeOllamaServer
+from llm_clients import LLMClient
+from llm_scheduler import BULK, INTERACTIVE, LLMQueueFull, ModelScheduler
+
+MODEL = "llama3.2"
+
+@pytest.fixture
+def server() -> Iterator[FakeOllamaServer]:
+    with FakeOllamaServer() as server:
+        yield server
+
+def _client(server: FakeOllamaServer, max_queue: int = 64, queue_timeout: float = 5.0) -> LLMClient:
+    """A client with one slot, so every other request has to queue."""
+    client = LLMClient(MODEL, ollama.Client(host=server.url), max_concurrency=1)
+    client.scheduler = ModelScheduler(MODEL, 1, max_queue, queue_timeout)
+    return client
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.005)
+
+def test_waiting_requests_are_served_by_priority_then_arrival(server: FakeOllamaServer):
+    client = _client(server)
+    queued = [("bulk 1", BULK), ("interactive 1", INTERACTIVE), ("bulk 2", BULK), ("interactive 2", INTERACTIVE)]
+
+    with ThreadPoolExecutor(max_workers=len(queued)) as executor:
+        with client.scheduler.slot():
+            futures = []
+            for depth, (prompt, priority) in enumerate(queued, start=1):
+                futures.append(executor.submit(client.generate, prompt, priority=priority))
+                _wait_for(lambda: client.scheduler.depth == depth)
+        assert [future.result() for future in futures] == [server.reply] * len(queued)
+
+    assert server.prompts == ["interactive 1", "interactive 2", "bulk 1", "bulk 2"]
+    assert client.scheduler.stats() == {"depth": 0, "active": 0, "completed": 5, "rejected": 0, "timed_out": 0}
+
+def test_requests_beyond_max_queue_are_rejected(server: FakeOllamaServer):
+    client = _client(server, max_queue=1)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with client.scheduler.slot():
+            waiting = executor.submit(client.generate, "queued")
+            _wait_for(lambda: client.scheduler.depth == 1)
+            with pytest.raises(LLMQueueFull):
+                client.generate("rejected")
+        assert waiting.result() == server.reply
+
+    assert server.prompts == ["queued"]
+    assert client.scheduler.stats()["rejected"] == 1
+
+def test_request_gives_up_after_queue_timeout(server: FakeOllamaServer):
+    client = _client(server, queue_timeout=0.05)
+
+    with client.scheduler.slot():
+        with pytest.raises(TimeoutError):
+            client.generate("too late")
+
+    assert server.prompts == []
+    assert client.scheduler.stats() == {"depth": 0, "active": 0, "completed": 1, "rejected": 0, "timed_out": 1}
+
+def test_release_skips_abandoned_tickets(server: FakeOllamaServer):
+    client = _client(server)
+    scheduler = client.scheduler
+    scheduler.acquire()
+
+    # Times out while the slot is held and leaves its ticket behind in the queue
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(timeout=0.05)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        waiting = executor.submit(client.generate, "after abandoned")
+        _wait_for(lambda: scheduler.depth == 1)
+        scheduler.release()
+        assert waiting.result() == server.reply
+
+    assert server.prompts == ["after abandoned"]
+    assert scheduler.stats() == {"depth": 0, "active": 0, "completed": 2, "rejected": 0, "timed_out": 1}
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from result_cache import ResultCache
+
+def test_waiting_caller_takes_over_when_the_leader_is_cancelled():
+    cache = ResultCache("test")
+    calls = []
+
+    async def compute() -> str:
+        calls.append(len(calls))
+        await asyncio.sleep(0.1 if len(calls) == 1 else 0)
+        return f"answer {len(calls)}"
+
+    async def race() -> None:
+        leader = asyncio.create_task(cache.get_or_compute_async("weather in Paris", compute))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_compute_async("weather in Paris", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert await waiter == "answer 2"
+
+    asyncio.run(race())
+
+    assert calls == [0, 1]
+    assert cache.get_or_compute("weather in Paris", lambda: "recomputed") == "answer 2"
+
+def test_waiting_caller_gets_the_leaders_error():
+    cache = ResultCache("test")
+
+    async def compute() -> str:
+        await asyncio.sleep(0.05)
+        raise ValueError("scrape failed")
+
+    async def race() -> None:
+        results = await asyncio.gather(
+            cache.get_or_compute_async("weather in Paris", compute),
+            cache.get_or_compute_async("weather in Paris", compute),
+            return_exceptions=True,
+        )
+        assert [type(result) for result in results] == [ValueError, ValueError]
+
+    asyncio.run(race())
+
+    assert cache.stats()["coalesced"] == 1
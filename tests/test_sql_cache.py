@@ -0,0 +1,70 @@
+import pytest
+from sql_cache import PreparedSql, SqlStatementCache, prepare_sql, question_signature
+
+SCHEMA = """
+Tables:
+users (id INT, name VARCHAR, email VARCHAR)
+products (id INT, name VARCHAR, price DECIMAL)
+orders (id INT, user_id INT, product_id INT, quantity INT)
+"""
+
+def test_question_signature_strips_literals():
+    assert question_signature("Delete user with ID 2") == ("delete user with id <value>", [2])
+    assert question_signature("Update user 4 set email to 'a@b.io' on 2024-01-05?") == (
+        "update user <value> set email to <value> on <value>", [4, "a@b.io", "2024-01-05"]
+    )
+
+def test_prepare_sql_parameterizes_literals_in_placeholder_order():
+    _, literals = question_signature("Show orders of user 4 for product 9")
+
+    assert prepare_sql("```sql\nSELECT * FROM orders WHERE product_id = 9 AND user_id = 4;\n```", literals, SCHEMA) == PreparedSql(
+        "SELECT * FROM orders WHERE product_id = %s AND user_id = %s", (1, 0)
+    )
+
+@pytest.mark.parametrize("question, sql", [
+    # The same literal twice: which occurrence varies with the question is ambiguous
+    ("Show orders of user 2 with quantity 2", "SELECT * FROM orders WHERE user_id = 2 AND quantity = 2"),
+    ("Show products cheaper than 5", "SELECT * FROM products WHERE price < 5 OR id = 5"),
+    # Literals inside a longer quoted string or date can't be bound on their own
+    ("Find the product named Widget 3 Pro", "SELECT * FROM products WHERE name = 'Widget 3 Pro'"),
+    ("Show orders from 2024", "SELECT * FROM orders WHERE placed_at >= '2024-01-01'"),
+    ("Show orders placed on 2024-01-05", "SELECT * FROM orders WHERE placed_at >= '2024-01-05 00:00:00'"),
+    # The question's literal was rewritten, so it isn't in the SQL
+    ("Find users named 'Bob'", "SELECT * FROM users WHERE LOWER(name) = 'bob'"),
+    ("Show all customers with ID 2", "SELECT * FROM customers WHERE id = 2"),
+    ("Show orders of user 2", "SELECT * FROM orders JOIN invoices ON invoices.order_id = orders.id WHERE user_id = 2"),
+    ("Find users named like Bo", "SELECT * FROM users WHERE name LIKE 'Bo%'"),
+    ("Delete user with ID 2", "DELETE FROM users WHERE id = 2; DROP TABLE users"),
+    ("Delete user with ID 2", "DROP TABLE users"),
+], ids=[
+    "repeated-literal", "literal-repeated-in-sql", "number-in-string", "number-in-date", "date-in-timestamp",
+    "rewritten-string", "unknown-table", "unknown-joined-table", "percent", "multi-statement", "not-a-query",
+])
+def test_prepare_sql_refuses_unsafe_sql(question: str, sql: str):
+    assert prepare_sql(sql, question_signature(question)[1], SCHEMA) is None
+
+def test_cached_sql_is_rebound_to_new_literals():
+    cache = SqlStatementCache()
+
+    assert cache.store("Delete user with ID 2", SCHEMA, "DELETE FROM users WHERE id = 2;") == ("DELETE FROM users WHERE id = %s", (2,))
+    assert cache.lookup("Delete user with ID 3", SCHEMA) == ("DELETE FROM users WHERE id = %s", (3,))
+    assert cache.store("Find users named 'Bob'", SCHEMA, "SELECT * FROM users WHERE name = 'Bob'") == (
+        "SELECT * FROM users WHERE name = %s", ("Bob",)
+    )
+    assert cache.lookup("Find users named 'Ann'", SCHEMA) == ("SELECT * FROM users WHERE name = %s", ("Ann",))
+    assert cache.stats()["hits"] == 2
+
+def test_uncacheable_sql_is_not_reused():
+    cache = SqlStatementCache()
+
+    assert cache.store("Show orders of user 2 with quantity 2", SCHEMA,
+                       "SELECT * FROM orders WHERE user_id = 2 AND quantity = 2") is None
+    assert cache.lookup("Show orders of user 3 with quantity 1", SCHEMA) is None
+    assert cache.stats()["uncacheable"] == 1
+
+def test_schema_change_drops_cached_sql():
+    cache = SqlStatementCache()
+    cache.store("Delete user with ID 2", SCHEMA, "DELETE FROM users WHERE id = 2")
+
+    assert cache.lookup("Delete user with ID 3", f"{SCHEMA}\ninvoices (id INT, order_id INT)") is None
+    assert cache.stats()["invalidations"] == 1
@@ -0,0 +1,88 @@
+import pytest
+from db_handler import DB_SCHEMA
+from query_classifier import TRAINING_DATA
+from sql_templates import match_sql_template
+
+# Expected (sql, params) for every SQL question in TRAINING_DATA; None means the LLM writes the SQL
+TRAINING_SQL = {
+    "Show me all the users of the database": ("SELECT * FROM users", ()),
+    "Insert a new user with name Alice and email alice@example.com into the database": (
+        "INSERT INTO users (name, email) VALUES (%s, %s)", ("Alice", "alice@example.com")),
+    "Update the user with ID 2 to have the email alice_updated@example.com": (
+        "UPDATE users SET email = %s WHERE id = %s", ("alice_updated@example.com", 2)),
+    "Delete user with ID 3": ("DELETE FROM users WHERE id = %s", (3,)),
+    "List all products in the database": ("SELECT * FROM products", ()),
+    "Insert a new product with name 'Smartphone' and price 700": (
+        "INSERT INTO products (name, price) VALUES (%s, %s)", ("Smartphone", 700)),
+    "Update product with ID 5 to have price 750": ("UPDATE products SET price = %s WHERE id = %s", (750, 5)),
+    "Delete product with ID 4": ("DELETE FROM products WHERE id = %s", (4,)),
+    "Show all orders in the database": ("SELECT * FROM orders", ()),
+    "Add a new order for user ID 1 with product ID 2 and quantity 3": None,
+    "Update order with ID 10 to set quantity to 5": ("UPDATE orders SET quantity = %s WHERE id = %s", (5, 10)),
+    "Delete order with ID 12": ("DELETE FROM orders WHERE id = %s", (12,)),
+    "Show the total number of users": ("SELECT COUNT(*) AS total FROM users", ()),
+    "Show the total number of products": ("SELECT COUNT(*) AS total FROM products", ()),
+    "List all orders placed by user with ID 2": ("SELECT * FROM orders WHERE user_id = %s", (2,)),
+    "Find all products that cost more than 500": ("SELECT * FROM products WHERE price > %s", (500,)),
+    "Show all users who have placed an order": None,
+    "Find the order with the highest quantity": None,
+    "List all users who registered after 2022": None,
+    "Show the average price of all products": None,
+    "Find all orders that were placed on 2023-01-15": None,
+    "Insert a new user with name John and email john@example.com of the database": (
+        "INSERT INTO users (name, email) VALUES (%s, %s)", ("John", "john@example.com")),
+    "Update user with ID 1 to have email john_updated@example.com of the database": (
+        "UPDATE users SET email = %s WHERE id = %s", ("john_updated@example.com", 1)),
+    "Delete user with ID 2": ("DELETE FROM users WHERE id = %s", (2,)),
+    "List all products": ("SELECT * FROM products", ()),
+    "Insert a new product with name 'Laptop' and price 1200": (
+        "INSERT INTO products (name, price) VALUES (%s, %s)", ("Laptop", 1200)),
+    "Update product with ID 3 to have price 1300": ("UPDATE products SET price = %s WHERE id = %s", (1300, 3)),
+    "Write a query to delete product with ID 4": ("DELETE FROM products WHERE id = %s", (4,)),
+    "Write a query to see all the users": ("SELECT * FROM users", ()),
+    "Write a query to see all the products": ("SELECT * FROM products", ()),
+    "Write a query to update the age": None,
+    "database": None,
+}
+
+def test_every_training_sql_query_has_an_expectation():
+    assert {query for query, label in TRAINING_DATA if label == "sql"} == set(TRAINING_SQL)
+
+@pytest.mark.parametrize("question, expected", TRAINING_SQL.items(), ids=list(TRAINING_SQL))
+def test_training_sql_queries(question, expected):
+    match = match_sql_template(question, DB_SCHEMA)
+
+    assert (match and (match.sql, match.params)) == expected
+
+@pytest.mark.parametrize("question", [
+    # Several columns
+    "Update user with ID 2 to set name to Bob and email to bob@example.com",
+    "Update user with ID 2 to have name 'Bob', email bob@example.com",
+    "Update user with ID 2 to have name Bob Smith",
+    # Extra clauses
+    "Update product with ID 3 to have price 1300 where name is Laptop",
+    "Delete user with ID 3 or ID 4",
+    "Delete user with ID 2 where name is Bob",
+    "Show user with ID 2 and name Bob",
+    "List all users where name is Bob",
+    "Find all products that cost more than 500 and less than 900",
+    # Columns that are not in the schema or must not be written
+    "Update user with ID 1 to have age 30",
+    "Update user with ID 2 to have id 5",
+    "Insert a new user with name Bob and age 30",
+    "Insert a new user with id 7 and name Bob",
+    # Tables that are not in the schema
+    "Delete customer with ID 3",
+    "List all invoices",
+    "Show the total number of customers",
+    "Update customer with ID 1 to have email a@example.com",
+    "Insert a new customer with name Bob",
+    "List all orders placed by customer with ID 2",
+])
+def test_falls_back_to_llm(question):
+    assert match_sql_template(question, DB_SCHEMA) is None
+
+def test_quoted_update_value_keeps_spaces():
+    match = match_sql_template("Update user with ID 2 to set name to 'Bob Smith'", DB_SCHEMA)
+
+    assert (match.sql, match.params) == ("UPDATE users SET name = %s WHERE id = %s", ("Bob Smith", 2))
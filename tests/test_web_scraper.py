@@ -0,0 +1,142 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+import pytest
+from metrics import METRICS, route_context
+from web_scraper import HttpBackend, ScraperBackend, SeleniumBackend, parse_results_page, scrape, scrape_many
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+SEARCH_URL = "https://search.test"
+
+def _fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as page:
+        return page.read()
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+    def raise_for_status(self) -> None:
+        pass
+
+class FakeSession:
+    """Stands in for requests.Session: serves a saved page or raises."""
+
+    def __init__(self, page: Optional[str] = None, error: Optional[Exception] = None):
+        self.headers = {}
+        self.page = page
+        self.error = error
+        self.urls: List[str] = []
+
+    def get(self, url: str, timeout: float) -> FakeResponse:
+        self.urls.append(url)
+        if self.error is not None:
+            raise self.error
+        return FakeResponse(self.page)
+
+class FakeDriver:
+    """Stands in for a Chrome session that has rendered a saved page."""
+
+    def __init__(self, page: str):
+        self.page_source = page
+        self.urls: List[str] = []
+
+    def get(self, url: str) -> None:
+        self.urls.append(url)
+
+    def find_element(self, *args) -> object:
+        return object()
+
+class FakePool:
+    def __init__(self, driver: FakeDriver):
+        self._driver = driver
+
+    @contextmanager
+    def driver(self) -> Iterator[FakeDriver]:
+        yield self._driver
+
+def test_parse_results_page_extracts_saved_page():
+    results, live_info, featured_snippet = parse_results_page(_fixture("weather_results.html"), "weather in Paris")
+
+    # The stale 2019 article and the result without a link are dropped
+    assert [result["url"] for result in results] == ["https://weather.example.com/paris"]
+    assert results[0]["title"] == "Paris weather forecast"
+    assert results[0]["snippet"] == "Hourly and 10-day forecast for Paris."
+    assert live_info == "Live Weather: 21°C, Partly cloudy"
+    assert featured_snippet == "Paris is partly cloudy with a high of 24°C."
+
+def test_parse_results_page_ignores_weather_widget_for_other_queries():
+    _, live_info, _ = parse_results_page(_fixture("weather_results.html"), "Paris forecast")
+
+    assert live_info is None
+
+def test_parse_results_page_without_results():
+    assert parse_results_page(_fixture("no_results.html"), "weather in Paris") == ([], None, None)
+
+def test_scrape_uses_http_result_without_starting_browser():
+    session = FakeSession(page=_fixture("weather_results.html"))
+    driver = FakeDriver(_fixture("weather_results.html"))
+
+    results, _, _ = scrape("weather in Paris", search_url=SEARCH_URL,
+                           backends=[HttpBackend(session_factory=lambda: session), SeleniumBackend(FakePool(driver))])
+
+    assert len(results) == 1
+    assert session.urls == [f"{SEARCH_URL}/search?q=weather+in+Paris&hl=en"]
+    assert driver.urls == []
+
+@pytest.mark.parametrize("session", [
+    FakeSession(page=_fixture("no_results.html")),
+    FakeSession(error=ConnectionError("connection reset")),
+], ids=["empty", "error"])
+def test_scrape_falls_back_to_selenium(session: FakeSession):
+    driver = FakeDriver(_fixture("weather_results.html"))
+
+    results, live_info, featured_snippet = scrape("weather in Paris", search_url=SEARCH_URL,
+                                                  backends=[HttpBackend(session_factory=lambda: session), SeleniumBackend(FakePool(driver))])
+
+    assert len(session.urls) == 1
+    assert driver.urls == [f"{SEARCH_URL}/search?q=weather+in+Paris&hl=en"]
+    assert [result["url"] for result in results] == ["https://weather.example.com/paris"]
+    assert live_info == "Live Weather: 21°C, Partly cloudy"
+    assert featured_snippet == "Paris is partly cloudy with a high of 24°C."
+
+def test_scrape_returns_nothing_when_every_backend_fails():
+    driver = FakeDriver(_fixture("no_results.html"))
+
+    assert scrape("weather in Paris", search_url=SEARCH_URL,
+                  backends=[HttpBackend(session_factory=lambda: FakeSession(error=ConnectionError())), SeleniumBackend(FakePool(driver))]) == ([], None, None)
+
+def test_scraper_backend_is_abstract():
+    with pytest.raises(TypeError):
+        ScraperBackend()
+
+def test_http_backend_keeps_one_session_per_thread():
+    backend = HttpBackend(session_factory=FakeSession)
+    sessions = []
+    worker = threading.Thread(target=lambda: sessions.extend([backend.session, backend.session]))
+    worker.start()
+    worker.join()
+
+    assert sessions[0] is sessions[1]
+    assert backend.session is backend.session
+    assert backend.session is not sessions[0]
+    assert backend.session.headers["Accept-Language"] == "en-US,en;q=0.9"
+
+def test_scrape_many_labels_worker_stages_with_route():
+    METRICS.reset()
+    empty_session = FakeSession(page=_fixture("no_results.html"))
+    driver = FakeDriver(_fixture("weather_results.html"))
+
+    with route_context("dynamic"):
+        scrape_many(["weather in Paris"], pages=2, search_url=SEARCH_URL,
+                    backends=[HttpBackend(session_factory=lambda: empty_session), SeleniumBackend(FakePool(driver))])
+
+    stages = {(entry["labels"]["stage"], entry["labels"]["backend"], entry["labels"]["route"])
+              for entry in METRICS.to_json()["router_stage_seconds"]}
+    assert stages == {
+        (stage, backend, "dynamic")
+        for stage, backend in [("scrape_page_load", "http"), ("scrape_dom_extraction", "http"),
+                               ("scrape_browser_acquire", "selenium"), ("scrape_page_load", "selenium"),
+                               ("scrape_dom_extraction", "selenium")]
+    }
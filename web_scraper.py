@@ -1,31 +1,81 @@
+import contextvars
 import logging
-from typing import Tuple, List, Dict, Optional
+import threading
+from abc import ABC, abstractmethod
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Deque, Iterator, Sequence, Tuple, List, Dict, Optional
+from urllib.parse import urlencode
+import requests
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from datetime import datetime, timedelta
+from result_cache import get_result_cache
+from metrics import METRICS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
-def scrape(query: str) -> Tuple[List[Dict], Optional[str], Optional[str]]:
+SEARCH_URL = "https://www.google.com"
+
+# Backends tried in order by scrape(); later ones are only used when earlier ones find nothing
+SCRAPER_BACKENDS: List[str] = ["http", "selenium"]
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+ScrapeResult = Tuple[List[Dict], Optional[str], Optional[str]]
+
+SNIPPET_SELECTOR = "div.VwiC3b.yXK7lf.p4wth.r025kc.hJNv6b.Hdw6tb"
+
+# Defaults of scrape_many(): result pages fetched per query and concurrent page fetches.
+# "route_pages" is what cached_scrape(), and so the dynamic route, fetches per query;
+# above 1 it fans out with scrape_many(), multiplying search traffic and browsers held.
+FANOUT_CONFIG = {
+    "pages": 2,
+    "max_workers": 4,
+    "route_pages": 1,
+}
+
+RESULTS_PER_PAGE = 10
+
+DRIVER_POOL_CONFIG = {
+    "max_size": 4,
+    "max_uses": 50,
+    "idle_timeout": 300.0,
+    "headless": True,
+}
+
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process instead of once per browser."""
+    return ChromeDriverManager().install()
+
+def create_driver(headless: bool = True) -> webdriver.Chrome:
     """
-    Scrape Google for dynamic query responses.
+    Launch a Chrome instance configured for scraping.
 
     Args:
-        query (str): User query to search.
+        headless (bool): Run Chrome without a visible window.
 
     Returns:
-        Tuple[List[Dict], Optional[str], Optional[str]]: Scraped results, live info, and featured snippet.
+        webdriver.Chrome: New browser session.
     """
-    logger.info(f"Starting web scrape for query: {query}")
     options = Options()
+    if headless:
+        options.add_argument("--headless=new")
     # adding argument to disable the AutomationControlled flag 
     options.add_argument("--disable-blink-features=AutomationControlled") 
     
@@ -35,72 +85,593 @@ def scrape(query: str) -> Tuple[List[Dict], Optional[str], Optional[str]]:
     # turn-off userAutomationExtension 
     options.add_experimental_option("useAutomationExtension", False)
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    return webdriver.Chrome(service=Service(_chromedriver_path()), options=options)
+
+class _PooledDriver:
+    """A browser owned by a DriverPool together with its bookkeeping."""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+class DriverPool:
+    """
+    Bounded, thread-safe pool of warm Chrome sessions.
+
+    Drivers are handed out one caller at a time, health-checked before reuse,
+    recycled after max_uses scrapes and closed after idle_timeout seconds unused.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4,
+        max_uses: int = 50,
+        idle_timeout: float = 300.0,
+        headless: bool = True,
+        factory: Optional[Callable[[], webdriver.Chrome]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self._factory = factory or (lambda: create_driver(headless=headless))
+        self._idle: Deque[_PooledDriver] = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+
+    @property
+    def size(self) -> int:
+        """Number of live drivers, idle or checked out."""
+        return self._size
+
+    @property
+    def idle(self) -> int:
+        """Number of drivers waiting in the pool."""
+        return len(self._idle)
+
+    def _quit(self, pooled: _PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing driver: {e}")
+
+    def _discard(self, pooled: _PooledDriver) -> None:
+        self._quit(pooled)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _create(self) -> _PooledDriver:
+        """Create a driver for a slot already reserved in self._size."""
+        try:
+            with METRICS.stage("scrape_browser_startup", backend="selenium"):
+                pooled = _PooledDriver(self._factory())
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        self._start_reaper()
+        logger.info("Started new pooled browser")
+        return pooled
+
+    @staticmethod
+    def _is_healthy(pooled: _PooledDriver) -> bool:
+        try:
+            pooled.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _start_reaper(self) -> None:
+        with self._cond:
+            if self._reaper is not None or self.idle_timeout <= 0:
+                return
+            self._reaper = threading.Thread(target=self._reap, name="driver-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        interval = max(self.idle_timeout / 2, 1.0)
+        with self._cond:
+            while not self._closed:
+                self._cond.wait(interval)
+                expired = self._pop_expired()
+                if expired:
+                    self._cond.release()
+                    try:
+                        for pooled in expired:
+                            self._quit(pooled)
+                    finally:
+                        self._cond.acquire()
+
+    def _pop_expired(self) -> List[_PooledDriver]:
+        """Remove idle drivers past idle_timeout. Caller must hold the lock."""
+        deadline = time.monotonic() - self.idle_timeout
+        expired = [pooled for pooled in self._idle if pooled.last_used < deadline]
+        for pooled in expired:
+            self._idle.remove(pooled)
+            self._size -= 1
+        if expired:
+            logger.info(f"Evicted {len(expired)} idle browsers")
+        return expired
+
+    def evict_idle(self) -> int:
+        """
+        Close drivers that have been idle longer than idle_timeout.
+
+        Returns:
+            int: Number of drivers closed.
+        """
+        with self._cond:
+            expired = self._pop_expired()
+        for pooled in expired:
+            self._quit(pooled)
+        return len(expired)
+
+    def warm(self, count: Optional[int] = None) -> int:
+        """
+        Start browsers ahead of traffic so the first scrapes skip Chrome startup.
+
+        Args:
+            count (Optional[int]): Number of idle drivers wanted, capped at max_size. Defaults to max_size.
+
+        Returns:
+            int: Number of drivers started.
+        """
+        wanted = self.max_size if count is None else min(count, self.max_size)
+        started = 0
+        while True:
+            with self._cond:
+                if self._closed or len(self._idle) >= wanted or self._size >= self.max_size:
+                    return started
+                self._size += 1
+            pooled = self._create()
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+            started += 1
+
+    def acquire(self, timeout: Optional[float] = None) -> _PooledDriver:
+        """
+        Check a healthy driver out of the pool, starting one if there is room.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for a free driver. None waits forever.
+
+        Returns:
+            _PooledDriver: Driver to pass back to release().
+
+        Raises:
+            TimeoutError: If no driver became available in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                expired = self._pop_expired()
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    if self._idle:
+                        pooled, create = self._idle.pop(), False
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        pooled, create = None, True
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a browser from the pool")
+                    self._cond.wait(remaining)
+            for stale in expired:
+                self._quit(stale)
+            if create:
+                return self._create()
+            if self._is_healthy(pooled):
+                return pooled
+            logger.warning("Discarding unhealthy pooled browser")
+            self._discard(pooled)
+
+    def release(self, pooled: _PooledDriver, healthy: bool = True) -> None:
+        """
+        Return a driver to the pool, recycling it if it is worn out or broken.
+
+        Args:
+            pooled (_PooledDriver): Driver obtained from acquire().
+            healthy (bool): False if the caller saw the browser fail.
+        """
+        pooled.uses += 1
+        pooled.last_used = time.monotonic()
+        with self._cond:
+            keep = healthy and not self._closed and pooled.uses < self.max_uses
+            if keep:
+                self._idle.append(pooled)
+                self._cond.notify()
+                return
+        if healthy:
+            logger.info(f"Recycling browser after {pooled.uses} uses")
+        else:
+            logger.warning("Discarding browser that failed during use")
+        self._discard(pooled)
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator[webdriver.Chrome]:
+        """
+        Borrow a driver for the duration of a with-block.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for a free driver.
+
+        Yields:
+            webdriver.Chrome: Browser session.
+        """
+        pooled = self.acquire(timeout)
+        healthy = True
+        try:
+            yield pooled.driver
+        except Exception:
+            healthy = self._is_healthy(pooled)
+            raise
+        finally:
+            self.release(pooled, healthy)
+
+    def close(self) -> None:
+        """Close all idle drivers and stop handing out new ones."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+_pool_lock = threading.Lock()
+_driver_pool: Optional[DriverPool] = None
+
+def get_driver_pool() -> DriverPool:
+    """
+    Return the process-wide driver pool, creating it from DRIVER_POOL_CONFIG on first use.
+
+    Returns:
+        DriverPool: Shared pool.
+    """
+    global _driver_pool
+    if _driver_pool is None:
+        with _pool_lock:
+            if _driver_pool is None:
+                _driver_pool = DriverPool(**DRIVER_POOL_CONFIG)
+    return _driver_pool
+
+def _result_entry(title: str, url: Optional[str], snippet: str, date_text: Optional[str]) -> Optional[Dict]:
+    """
+    Build a result dict, dropping dated results older than a day.
+
+    Args:
+        title (str): Result title.
+        url (Optional[str]): Result link.
+        snippet (str): Result snippet text.
+        date_text (Optional[str]): Text of the result's date label, if any.
+
+    Returns:
+        Optional[Dict]: Result entry, or None if the result is stale.
+    """
+    try:
+        article_date = datetime.strptime(date_text, '%b %d, %Y')
+    except (TypeError, ValueError):
+        return {"title": title, "url": url, "snippet": snippet, "date": None}
+    if article_date > datetime.now() - timedelta(days=1):
+        return {"title": title, "url": url, "snippet": snippet, "date": article_date}
+    return None
+
+def parse_results_page(html: str, query: str) -> ScrapeResult:
+    """
+    Extract results, live info and featured snippet from a search results page.
+
+    Args:
+        html (str): Page source.
+        query (str): Query the page was searched for.
+
+    Returns:
+        ScrapeResult: Scraped results, live info, and featured snippet.
+    """
+    soup = BeautifulSoup(html, "html.parser")
     results: List[Dict] = []
     live_info: Optional[str] = None
     featured_snippet: Optional[str] = None
 
-    try:
-        driver.get("https://www.google.com")
-        logger.info("Opened Google homepage")
+    if "weather" in query.lower():
+        temperature = soup.select_one("#wob_wc #wob_tm")
+        image = soup.select_one("#wob_wc img")
+        if temperature is not None and image is not None:
+            live_info = f"Live Weather: {temperature.get_text(strip=True)}°C, {image.get('alt')}"
 
-        search_box = WebDriverWait(driver, 2).until(
-            EC.presence_of_element_located((By.NAME, "q"))
+    for element in soup.select("div.tF2Cxc"):
+        title = element.find("h3")
+        link = element.find("a")
+        if title is None or link is None:
+            continue
+        snippet = element.select_one(SNIPPET_SELECTOR)
+        date = element.select_one("span.f")
+        entry = _result_entry(
+            title.get_text(" ", strip=True),
+            link.get("href"),
+            snippet.get_text(" ", strip=True) if snippet is not None else "",
+            date.get_text(strip=True) if date is not None else None,
         )
-        search_box.send_keys(query)
-        search_box.send_keys(Keys.RETURN)
-        logger.info(f"Searched for: {query}")
+        if entry is not None:
+            results.append(entry)
 
-        WebDriverWait(driver, 2).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.tF2Cxc"))
-        )
+    featured = soup.select_one("div.VkpGBb")
+    if featured is not None:
+        featured_snippet = featured.get_text(" ", strip=True)
+    return results, live_info, featured_snippet
 
-        if "weather" in query.lower():
-            try:
-                weather_widget = driver.find_element(By.ID, "wob_wc")
-                temperature = weather_widget.find_element(By.ID, "wob_tm").text
-                weather_description = weather_widget.find_element(By.CSS_SELECTOR, "img").get_attribute("alt")
-                live_info = f"Live Weather: {temperature}°C, {weather_description}"
-                logger.info(f"Found live weather: {live_info}")
-            except:
-                logger.info("No live weather info found")
-
-        result_elements = driver.find_elements(By.CSS_SELECTOR, "div.tF2Cxc")
-        for element in result_elements:
+def results_page_url(search_url: str, query: str, start: int = 0) -> str:
+    """
+    URL of a results page, skipping the search homepage.
+
+    Args:
+        search_url (str): Search homepage, e.g. SEARCH_URL.
+        query (str): Query to search.
+        start (int): Offset of the first result, a multiple of RESULTS_PER_PAGE.
+
+    Returns:
+        str: Results page URL.
+    """
+    params = {"q": query, "hl": "en"}
+    if start:
+        params["start"] = str(start)
+    return f"{search_url.rstrip('/')}/search?{urlencode(params)}"
+
+class ScraperBackend(ABC):
+    """Interface of a search backend used by scrape()."""
+
+    name = "base"
+
+    def search(self, query: str, search_url: str) -> ScrapeResult:
+        """
+        Search for a query and extract the first results page.
+
+        Args:
+            query (str): User query to search.
+            search_url (str): Search homepage, e.g. SEARCH_URL.
+
+        Returns:
+            ScrapeResult: Scraped results, live info, and featured snippet.
+        """
+        return self.search_page(query, search_url, 0)
+
+    @abstractmethod
+    def search_page(self, query: str, search_url: str, start: int) -> ScrapeResult:
+        """
+        Fetch one results page and extract it.
+
+        Args:
+            query (str): User query to search.
+            search_url (str): Search homepage, e.g. SEARCH_URL.
+            start (int): Offset of the first result on the page.
+
+        Returns:
+            ScrapeResult: Scraped results, live info, and featured snippet.
+        """
+
+class HttpBackend(ScraperBackend):
+    """
+    Fetch the results page over plain HTTP and parse the static DOM.
+
+    requests.Session is not thread-safe, so each thread calling the backend,
+    e.g. the workers of scrape_many(), gets its own keep-alive session.
+    """
+
+    name = "http"
+
+    def __init__(self, timeout: float = 5.0, session_factory: Callable[[], requests.Session] = requests.Session):
+        self.timeout = timeout
+        self._session_factory = session_factory
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session of the calling thread."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._session_factory()
+            session.headers.update(HTTP_HEADERS)
+        return session
+
+    def search_page(self, query: str, search_url: str, start: int) -> ScrapeResult:
+        with METRICS.stage("scrape_page_load", backend=self.name):
+            response = self.session.get(results_page_url(search_url, query, start), timeout=self.timeout)
+            response.raise_for_status()
+        with METRICS.stage("scrape_dom_extraction", backend=self.name):
+            return parse_results_page(response.text, query)
+
+class SeleniumBackend(ScraperBackend):
+    """Render the results page in a pooled Chrome session."""
+
+    name = "selenium"
+
+    def __init__(self, pool: Optional[DriverPool] = None):
+        self._pool = pool
+
+    def search_page(self, query: str, search_url: str, start: int) -> ScrapeResult:
+        pool = self._pool or get_driver_pool()
+        acquire_start = time.perf_counter()
+        with pool.driver() as driver:
+            METRICS.observe_stage("scrape_browser_acquire", time.perf_counter() - acquire_start, backend=self.name)
+            return _scrape_with_driver(driver, query, search_url, start)
+
+_backends_lock = threading.Lock()
+_default_backends: Dict[str, ScraperBackend] = {}
+
+def get_scraper_backends(names: Optional[Sequence[str]] = None) -> List[ScraperBackend]:
+    """
+    Return shared backend instances in fallback order.
+
+    Args:
+        names (Optional[Sequence[str]]): Backend names. Defaults to SCRAPER_BACKENDS.
+
+    Returns:
+        List[ScraperBackend]: Backends to try in order.
+    """
+    factories = {"http": HttpBackend, "selenium": SeleniumBackend}
+    backends: List[ScraperBackend] = []
+    with _backends_lock:
+        for name in names or SCRAPER_BACKENDS:
+            if name not in _default_backends:
+                _default_backends[name] = factories[name]()
+            backends.append(_default_backends[name])
+    return backends
+
+def scrape(
+    query: str,
+    pool: Optional[DriverPool] = None,
+    search_url: Optional[str] = None,
+    backends: Optional[Sequence[ScraperBackend]] = None,
+) -> ScrapeResult:
+    """
+    Scrape Google for dynamic query responses.
+
+    Backends are tried in order and the first one that finds anything wins, so the
+    browser is only started when the plain HTTP page has nothing usable.
+
+    Args:
+        query (str): User query to search.
+        pool (Optional[DriverPool]): Pool for the Selenium backend. Defaults to the shared pool.
+        search_url (Optional[str]): Search homepage to use instead of SEARCH_URL, e.g. a local fixture server.
+        backends (Optional[Sequence[ScraperBackend]]): Backends to try. Defaults to SCRAPER_BACKENDS.
+
+    Returns:
+        ScrapeResult: Scraped results, live info, and featured snippet.
+    """
+    logger.info(f"Starting web scrape for query: {query}")
+    if backends is None:
+        backends = [SeleniumBackend(pool) if backend.name == "selenium" and pool is not None else backend
+                    for backend in get_scraper_backends()]
+    for backend in backends:
+        try:
+            results, live_info, featured_snippet = backend.search(query, search_url or SEARCH_URL)
+        except Exception as e:
+            logger.error(f"Scraping error in {backend.name} backend: {e}")
+            continue
+        if results or live_info or featured_snippet:
+            logger.info(f"Scraped {len(results)} results with {backend.name} backend")
+            return results, live_info, featured_snippet
+        logger.info(f"{backend.name} backend found nothing, falling back")
+    return [], None, None
+
+def _merge_pages(pages: Sequence[ScrapeResult]) -> ScrapeResult:
+    """Concatenate page results in order, keeping the first result per URL."""
+    results: List[Dict] = []
+    seen_urls = set()
+    live_info: Optional[str] = None
+    featured_snippet: Optional[str] = None
+    for page_results, page_live_info, page_snippet in pages:
+        for result in page_results:
+            if result["url"] in seen_urls:
+                continue
+            seen_urls.add(result["url"])
+            results.append(result)
+        live_info = live_info or page_live_info
+        featured_snippet = featured_snippet or page_snippet
+    return results, live_info, featured_snippet
+
+def scrape_many(
+    queries: Sequence[str],
+    pages: Optional[int] = None,
+    search_url: Optional[str] = None,
+    backends: Optional[Sequence[ScraperBackend]] = None,
+    max_workers: Optional[int] = None,
+) -> ScrapeResult:
+    """
+    Scrape several queries and result pages concurrently and merge them.
+
+    Every (query, page) pair is fetched in parallel on a thread pool, e.g. a
+    query and its reformulations over the first two result pages. Results are
+    deduplicated by URL, keeping the order of queries and pages. As in scrape(),
+    later backends are only used when earlier ones find nothing.
+
+    Args:
+        queries (Sequence[str]): Queries to search, e.g. reformulations of one question.
+        pages (Optional[int]): Result pages per query. Defaults to FANOUT_CONFIG["pages"].
+        search_url (Optional[str]): Search homepage to use instead of SEARCH_URL.
+        backends (Optional[Sequence[ScraperBackend]]): Backends to try. Defaults to SCRAPER_BACKENDS.
+        max_workers (Optional[int]): Concurrent fetches. Defaults to FANOUT_CONFIG["max_workers"].
+
+    Returns:
+        ScrapeResult: Merged results, first live info, and first featured snippet.
+    """
+    tasks = [(query, page * RESULTS_PER_PAGE) for query in queries for page in range(pages or FANOUT_CONFIG["pages"])]
+    if not tasks:
+        return [], None, None
+    logger.info(f"Fanning out {len(tasks)} page fetches for {len(queries)} queries")
+
+    for backend in backends or get_scraper_backends():
+        def fetch(task: Tuple[str, int]) -> ScrapeResult:
             try:
-                title = element.find_element(By.TAG_NAME, "h3").text
-                url = element.find_element(By.TAG_NAME, "a").get_attribute("href")
-                snippet = ""
-                try:
-                    snippet = element.find_element(By.CSS_SELECTOR, "div.VwiC3b.yXK7lf.p4wth.r025kc.hJNv6b.Hdw6tb").text
-                except:
-                    snippet = ""
-                try:
-                    date_element = element.find_element(By.CSS_SELECTOR, "span.f")
-                    date_text = date_element.text
-                    article_date = datetime.strptime(date_text, '%b %d, %Y')
-                    if article_date > datetime.now() - timedelta(days=1):
-                        results.append({"title": title, "url": url, "snippet": snippet, "date": article_date})
-                except:
-                    results.append({"title": title, "url": url, "snippet": snippet, "date": None})
+                return backend.search_page(task[0], search_url or SEARCH_URL, task[1])
             except Exception as e:
-                logger.warning(f"Error processing result: {e}")
+                logger.error(f"Scraping error in {backend.name} backend for {task}: {e}")
+                return [], None, None
 
-        try:
-            featured_snippet_element = driver.find_element(By.CSS_SELECTOR, "div.VkpGBb")
-            featured_snippet = featured_snippet_element.text
-            logger.info(f"Found featured snippet: {featured_snippet}")
-        except:
-            logger.info("No featured snippet found")
+        with ThreadPoolExecutor(max_workers=min(len(tasks), max_workers or FANOUT_CONFIG["max_workers"])) as executor:
+            # Each fetch runs in a copy of the caller's context so its stages keep the route label
+            futures = [executor.submit(contextvars.copy_context().run, fetch, task) for task in tasks]
+            results, live_info, featured_snippet = _merge_pages([future.result() for future in futures])
+        if results or live_info or featured_snippet:
+            logger.info(f"Scraped {len(results)} unique results with {backend.name} backend")
+            return results, live_info, featured_snippet
+        logger.info(f"{backend.name} backend found nothing, falling back")
+    return [], None, None
+
+def cached_scrape(query: str) -> ScrapeResult:
+    """
+    Scrape through the shared "scrape" result cache.
+
+    Only the first results page is scraped unless FANOUT_CONFIG["route_pages"]
+    opts in to fetching more of them concurrently with scrape_many(). Repeated
+    queries within their category's TTL are served from the cache, and
+    concurrent identical queries share one in-flight scrape. Empty scrapes are
+    not cached.
+
+    Args:
+        query (str): User query to search.
+
+    Returns:
+        ScrapeResult: Scraped results, live info, and featured snippet.
+    """
+    pages = FANOUT_CONFIG["route_pages"]
+    if pages > 1:
+        return get_result_cache("scrape").get_or_compute(query, lambda: scrape_many([query], pages=pages), cache_if=any)
+    return get_result_cache("scrape").get_or_compute(query, lambda: scrape(query), cache_if=any)
 
+def _scrape_with_driver(driver: webdriver.Chrome, query: str, search_url: str, start: int = 0) -> ScrapeResult:
+    """Open a results page on an already started browser and extract it from one DOM snapshot."""
+    try:
+        page_load_start = time.perf_counter()
+        driver.get(results_page_url(search_url, query, start))
+        logger.info(f"Searched for: {query} (start={start})")
+        try:
+            WebDriverWait(driver, 2).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div.tF2Cxc"))
+            )
+        except Exception:
+            logger.info("No organic results rendered")
+        # One round-trip for the whole rendered DOM instead of find_element calls per result
+        html = driver.page_source
+        METRICS.observe_stage("scrape_page_load", time.perf_counter() - page_load_start, backend="selenium")
+        with METRICS.stage("scrape_dom_extraction", backend="selenium"):
+            results, live_info, featured_snippet = parse_results_page(html, query)
         logger.info(f"Scraped {len(results)} results")
+        return results, live_info, featured_snippet
     except Exception as e:
         logger.error(f"Scraping error: {e}")
-    finally:
-        driver.quit()
-
-    return results, live_info, featured_snippet
+        return [], None, None
 
 if __name__ == "__main__":
     results, live_info, snippet = scrape("What is the weather today?")
-    logger.info(f"Results: {results[:2]}, Live Info: {live_info}, Snippet: {snippet}")
\ No newline at end of file
+    logger.info(f"Results: {results[:2]}, Live Info: {live_info}, Snippet: {snippet}")